@@ -6,7 +6,7 @@ import qasync
 from PyQt6.QtWidgets import QApplication
 
 from src.views.main_window import MainWindow
-from src.utils.logging import setup_logging, get_logger
+from src.utils.logging import setup_logging, shutdown_logging, get_logger
 
 
 # --- DEV BOOTSTRAP (USER DATA, NOT PROJECT DATA) -----------------
@@ -40,8 +40,11 @@ def main() -> None:
         logger.warning(f"File not found: {TEST_PDF}")
     # --------------------
 
-    with loop:
-        loop.run_forever()
+    try:
+        with loop:
+            loop.run_forever()
+    finally:
+        shutdown_logging()
 
 
 if __name__ == "__main__":
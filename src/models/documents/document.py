@@ -1,11 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict
+from typing import Optional, Dict, NamedTuple
+
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QImage
+
+
+class RenderResult(NamedTuple):
+    """A rendered page plus the scale it was rasterized at."""
+    image: QImage
+    scale: float
+    page_rect: QRectF
+
 
 class Document(ABC):
     """
     Abstract Interface for all document types (PDF, EPUB).
     Strictly read-only APIs.
     """
+    __slots__ = ()
 
     @abstractmethod
     def load(self, file_path: str) -> None:
@@ -34,9 +46,9 @@ class Document(ABC):
         pass
     
     @abstractmethod
-    def render_page(self, page_index: int, zoom_level: int = 100):
+    def render_page(self, page_index: int, zoom_level: int = 100) -> Optional[RenderResult]:
         """
-        Returns a QImage of the page.
+        Returns the rendered page with its scale and size in points.
         """
         pass
 
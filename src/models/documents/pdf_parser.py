@@ -1,33 +1,439 @@
+import asyncio
 import fitz
+import hashlib
+import numpy as np
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PyQt6.QtCore import Qt, QRectF
 from PyQt6.QtGui import QImage
-from PyQt6.QtCore import QRectF
 from typing import List, Tuple
 
-from .document import Document
+from .document import Document, RenderResult
 from ..selection.selection_model import CharMetadata
+from ...utils.logging import get_logger
+from ...utils.paths import CACHE_DIR
+
+PAGE_CACHE_DIR = CACHE_DIR / "pages"
+
+
+def _pixmap_buffer(pix: fitz.Pixmap):
+    """MuPDF's pixel buffer without a bytes copy (samples_mv), where available."""
+    samples_mv = getattr(pix, "samples_mv", None)
+    return samples_mv if samples_mv is not None else pix.samples
+
+
+def _wrap_pixels(owner, data, width: int, height: int, stride: int, fmt) -> QImage:
+    """
+    Builds a QImage over `data` without copying it.
+    The buffer's owner rides along on the Python wrapper, so the pixels live
+    exactly as long as that QImage object. A C++-side copy (e.g. a signal
+    typed as QImage) does not carry the owner; use .copy() for those.
+    """
+    qimg = QImage(data, width, height, stride, fmt)
+    qimg.pixel_owner = owner
+    return qimg
+
+
+def _chars_from_textpage(textpage: fitz.TextPage) -> List[CharMetadata]:
+    text_data = textpage.extractRAWDICT()
+
+    chars: List[CharMetadata] = []
+    append = chars.append
+    # Pages repeat a small alphabet; share one string object per glyph.
+    intern = sys.intern
+
+    for block in text_data["blocks"]:
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                for char_info in span.get("chars", []):
+                    append(CharMetadata(intern(char_info["c"]), char_info["bbox"]))
+
+    return chars
+
+
+# Indexed by `pix.n == 3`.
+_PIXMAP_FORMATS = (QImage.Format.Format_RGBA8888, QImage.Format.Format_RGB888)
+# The raster pixmap formats; converting to these here keeps QPixmap.fromImage
+# on the GUI thread a plain copy.
+_DISPLAY_FORMATS = (QImage.Format.Format_ARGB32_Premultiplied, QImage.Format.Format_RGB32)
 
 
 class PdfParser(Document):
+    __slots__ = (
+        "_logger",
+        "_doc",
+        "_file_path",
+        "_content_hash",
+        "_cache_lock",
+        "_render_cache",
+        "_render_cache_bytes",
+        "_char_map_cache",
+        "_pool",
+        "_local",
+        "_worker_docs",
+        "_prefetch_tasks",
+        "_writer",
+        "_disk_cache_bytes",
+    )
+
+    RENDER_CACHE_BYTES = 200 * 1024 * 1024
+    CHAR_MAP_CACHE_SIZE = 64
+    TEXTPAGE_CACHE_SIZE = 8
+    DISK_CACHE_BYTES = 512 * 1024 * 1024
+    WORKER_COUNT = 2
+    PREFETCH_OFFSETS = (1, -1)
+
     def __init__(self):
+        self._logger = get_logger("PdfParser")
         self._doc: fitz.Document | None = None
+        self._file_path: str | None = None
+        self._content_hash: str | None = None
+
+        # Renders run on worker threads, so cache access is serialized.
+        self._cache_lock = threading.Lock()
+        # Rendered pages by (page_index, zoom_level), bounded by pixel bytes.
+        self._render_cache: OrderedDict[tuple[int, int], QImage] = OrderedDict()
+        self._render_cache_bytes = 0
+        self._char_map_cache: OrderedDict[int, List[CharMetadata]] = OrderedDict()
+
+        # One pool per document. Like the warmup workers, each pool thread
+        # opens its own handle (plus its own TextPage cache): `_doc` itself
+        # is only used on the GUI thread.
+        self._pool: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._worker_docs: List[fitz.Document] = []
+
+        # PNG writes run on their own thread, off the render path. The byte
+        # total is only touched there; None until the first write scans.
+        self._writer: ThreadPoolExecutor | None = None
+        self._disk_cache_bytes: int | None = None
+        self._prefetch_tasks: dict[tuple[int, int], asyncio.Task] = {}
 
     def load(self, path: str):
-        """Loads a PDF file."""
+        """Loads a PDF file. Raises if MuPDF cannot open it."""
+        self._close_document()
         try:
             self._doc = fitz.open(path)
         except Exception as e:
-            print(f"Error loading PDF: {e}")
-            self._doc = None
+            self._logger.error(f"Error loading PDF: {e}")
+            raise
+        self._file_path = path
 
     def close(self):
-        """Closes the document."""
-        if self._doc:
-            self._doc.close()
-            self._doc = None
+        """Closes the document and stops the worker threads."""
+        self._close_document()
+        if self._writer:
+            # A write in progress still lands through its temp file.
+            self._writer.shutdown(wait=False, cancel_futures=True)
+            self._writer = None
+
+    def _close_document(self):
+        self.cancel_prefetch()
+        # Queued jobs see no document and return; running ones finish on
+        # their own handles before those are closed.
+        doc, self._doc = self._doc, None
+        self._stop_pool()
+        if doc:
+            doc.close()
+        self._file_path = None
+        self._content_hash = None
+        self._clear_caches()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.WORKER_COUNT,
+                initializer=self._open_worker_doc,
+                initargs=(self._file_path,),
+            )
+        return self._pool
+
+    def _stop_pool(self):
+        """Waits for running jobs, then closes the workers' handles."""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        with self._cache_lock:
+            docs, self._worker_docs = self._worker_docs, []
+        for doc in docs:
+            doc.close()
+
+    def _open_worker_doc(self, path: str | None):
+        if path is None:
+            return
+        doc = fitz.open(path)
+        self._local.doc = doc
+        self._local.textpages = OrderedDict()
+        with self._cache_lock:
+            self._worker_docs.append(doc)
+
+    def _thread_doc(self) -> fitz.Document:
+        """This pool thread's handle; other threads fall back to `_doc`."""
+        doc = getattr(self._local, "doc", None)
+        return doc if doc is not None else self._doc
+
+    async def render_page_async(
+        self, page_index: int, zoom_level: int = 100
+    ) -> RenderResult | None:
+        """Renders a page on a worker thread, keeping the Qt loop responsive."""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._get_pool(), self.render_page, page_index, zoom_level
+        )
+        self._schedule_prefetch(page_index, zoom_level)
+        return result
+
+    def _schedule_prefetch(self, page_index: int, zoom_level: int):
+        """Warms the render cache with the neighbours of a page just served."""
+        for offset in self.PREFETCH_OFFSETS:
+            neighbour = page_index + offset
+            key = (neighbour, zoom_level)
+            if not (0 <= neighbour < self.get_page_count()):
+                continue
+            if key in self._prefetch_tasks or key in self._render_cache:
+                continue
+
+            task = asyncio.ensure_future(self._prefetch(neighbour, zoom_level))
+            self._prefetch_tasks[key] = task
+            task.add_done_callback(
+                lambda t, key=key: self._forget_prefetch(key, t)
+            )
+
+    def _forget_prefetch(self, key: tuple[int, int], task: asyncio.Task):
+        if self._prefetch_tasks.get(key) is task:
+            del self._prefetch_tasks[key]
+
+    async def _prefetch(self, page_index: int, zoom_level: int):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self._get_pool(), self.render_page, page_index, zoom_level
+            )
+        except Exception as e:
+            self._logger.warning(f"Prefetch of page {page_index} failed: {e}")
+
+    def cancel_prefetch(self):
+        """Drops pending prefetches, e.g. when the zoom level changes."""
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        self._prefetch_tasks.clear()
+
+    async def get_character_map_async(self, page_index: int) -> List[CharMetadata]:
+        """Extracts a character map on a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(), self.get_character_map, page_index
+        )
+
+    def warmup(self, page_range: range):
+        """
+        Extracts character maps for `page_range` in parallel, in the background.
+        Each worker opens its own fitz.Document: one handle must not be used
+        from several threads, but separate handles on the same file are fine.
+        """
+        if not self._doc:
+            return
+
+        with self._cache_lock:
+            pages = [i for i in page_range if i not in self._char_map_cache]
+        if not pages:
+            return
+
+        threading.Thread(
+            target=self._warmup_worker,
+            args=(self._file_path, pages),
+            daemon=True,
+        ).start()
+
+    def _warmup_worker(self, path: str, pages: List[int]):
+        local = threading.local()
+        handles: List[fitz.Document] = []
+
+        def open_handle():
+            local.doc = fitz.open(path)
+            handles.append(local.doc)
+
+        def extract(page_index: int):
+            textpage = local.doc[page_index].get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+            chars = _chars_from_textpage(textpage)
+            # Skip the store if another document was opened meanwhile.
+            if self._file_path == path:
+                self._cache_put(
+                    self._char_map_cache, page_index, chars, self.CHAR_MAP_CACHE_SIZE
+                )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(pages)),
+                initializer=open_handle,
+            ) as pool:
+                for _ in pool.map(extract, pages):
+                    pass
+        except Exception as e:
+            self._logger.warning(f"Warmup failed: {e}")
+        finally:
+            for doc in handles:
+                doc.close()
+
+    def _get_content_hash(self) -> str | None:
+        """
+        BLAKE2b of the file contents, computed once per document on a worker.
+        None when no document is open.
+        """
+        with self._cache_lock:
+            path, content_hash = self._file_path, self._content_hash
+        if content_hash is not None or path is None:
+            return content_hash
+
+        # Read outside the lock so other workers' cache lookups don't wait.
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        with self._cache_lock:
+            if self._file_path == path:
+                self._content_hash = content_hash
+        return content_hash
+
+    def _disk_cache_path(self, page_index: int, zoom_level: int) -> Path | None:
+        content_hash = self._get_content_hash()
+        if content_hash is None:
+            return None
+        return PAGE_CACHE_DIR / content_hash / f"p{page_index}_z{zoom_level}.png"
+
+    def _load_from_disk(self, path: Path) -> QImage | None:
+        if not path.exists():
+            return None
+        qimg = QImage(str(path))
+        if qimg.isNull():
+            return None
+        try:
+            os.utime(path)  # Pruning goes by mtime, oldest first
+        except OSError:
+            pass
+        return qimg
+
+    def _queue_disk_write(self, path: Path, qimg: QImage):
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PageCacheWriter")
+        self._writer.submit(self._save_to_disk, path, qimg)
+
+    def _save_to_disk(self, path: Path, qimg: QImage):
+        """Writes through a temp file so readers never see a partial PNG."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            if qimg.save(str(tmp_path), "PNG", 85):
+                os.replace(tmp_path, path)
+                self._account_disk_write(path.stat().st_size)
+        except OSError as e:
+            self._logger.warning(f"Failed to write page cache {path}: {e}")
+
+    def _account_disk_write(self, size: int):
+        if self._disk_cache_bytes is None:
+            # The first scan already counts this file.
+            self._disk_cache_bytes = self._prune_disk_cache()
+            return
+        self._disk_cache_bytes += size
+        if self._disk_cache_bytes > self.DISK_CACHE_BYTES:
+            self._disk_cache_bytes = self._prune_disk_cache()
+
+    def _prune_disk_cache(self) -> int:
+        """
+        Deletes the least recently used page PNGs while the cache exceeds
+        DISK_CACHE_BYTES, down to 90% so the next writes don't rescan.
+        Returns the bytes left.
+        """
+        entries = []
+        for path in PAGE_CACHE_DIR.glob("*/*.png"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.DISK_CACHE_BYTES:
+            return total
+
+        target = self.DISK_CACHE_BYTES * 9 // 10
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+        # Drop documents with no pages left.
+        for folder in PAGE_CACHE_DIR.iterdir():
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+        self._logger.info(f"Pruned page cache to {total >> 20} MB")
+        return total
+
+    def _clear_caches(self):
+        with self._cache_lock:
+            self._render_cache.clear()
+            self._render_cache_bytes = 0
+            self._char_map_cache.clear()
+
+    def _cache_get(self, cache: OrderedDict, key):
+        """Returns a cached value and marks it most recently used."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key, value, capacity: int):
+        """Stores a value, evicting least recently used entries."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > capacity:
+                cache.popitem(last=False)
+
+    def _cache_render(self, key: tuple[int, int], qimg: QImage):
+        """Stores a render, evicting the least recently used past RENDER_CACHE_BYTES."""
+        with self._cache_lock:
+            old = self._render_cache.pop(key, None)
+            if old is not None:
+                self._render_cache_bytes -= old.sizeInBytes()
+            self._render_cache[key] = qimg
+            self._render_cache_bytes += qimg.sizeInBytes()
+            while self._render_cache_bytes > self.RENDER_CACHE_BYTES and len(self._render_cache) > 1:
+                _, evicted = self._render_cache.popitem(last=False)
+                self._render_cache_bytes -= evicted.sizeInBytes()
+
+    def get_cached_render(self, page_index: int, zoom_level: int) -> QImage | None:
+        """Returns a render from memory without touching a worker, if cached."""
+        return self._cache_get(self._render_cache, (page_index, zoom_level))
 
     def get_metadata(self) -> dict:
-        """Returns PDF metadata."""
-        return self._doc.metadata if self._doc else {}
+        """Returns {'title': ..., 'author': ...}, falling back to the file name."""
+        if not self._doc:
+            return {}
+
+        raw = self._doc.metadata or {}
+        title = " ".join((raw.get("title") or "").split())
+        author = " ".join((raw.get("author") or "").split())
+
+        return {
+            "title": title or Path(self._file_path).stem,
+            "author": author,
+        }
 
     def get_page_count(self) -> int:
         """Returns the number of pages."""
@@ -46,54 +452,154 @@ class PdfParser(Document):
         """Returns raw page text."""
         if not self._doc:
             return ""
-        return self._doc[page_index].get_text()
+        return self._ensure_textpage(page_index).extractText()
+
+    def _ensure_textpage(self, page_index: int) -> fitz.TextPage:
+        """
+        Returns the page's TextPage, so layout analysis runs once per visit.
+        TextPages belong to the handle they came from, so each pool thread
+        caches its own; other threads build one per call.
+        """
+        textpages = getattr(self._local, "textpages", None)
+        if textpages is not None:
+            textpage = textpages.get(page_index)
+            if textpage is not None:
+                textpages.move_to_end(page_index)
+                return textpage
+
+        # Plain-text flags: no embedded image blocks.
+        textpage = self._thread_doc()[page_index].get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+        if textpages is not None:
+            textpages[page_index] = textpage
+            while len(textpages) > self.TEXTPAGE_CACHE_SIZE:
+                textpages.popitem(last=False)
+        return textpage
 
-    def render_page(self, page_index: int, zoom_level: int = 100) -> QImage | None:
-        """Renders a page to a QImage."""
+    def render_page(self, page_index: int, zoom_level: int = 100) -> RenderResult | None:
+        """
+        Renders a page, reusing cached renders.
+        Colour pages are converted into images that own their pixels. Gray
+        pages wrap a NumPy plane that only the Python QImage keeps alive;
+        see _wrap_pixels.
+        """
         if not self._doc:
             return None
 
-        page = self._doc[page_index]
+        qimg = self._render_image(page_index, zoom_level)
+        r = self._thread_doc()[page_index].rect
+        return RenderResult(qimg, zoom_level / 100.0, QRectF(r.x0, r.y0, r.width, r.height))
+
+    def _render_image(self, page_index: int, zoom_level: int) -> QImage:
+        key = (page_index, zoom_level)
+        cached = self._cache_get(self._render_cache, key)
+        if cached is not None:
+            return cached
+
+        qimg = self._scale_from_master(page_index, zoom_level)
+        if qimg is not None:
+            self._cache_render(key, qimg)
+            return qimg
+
+        try:
+            disk_path = self._disk_cache_path(page_index, zoom_level)
+        except OSError as e:
+            self._logger.warning(f"Page cache unavailable: {e}")
+            disk_path = None
+
+        if disk_path is not None:
+            qimg = self._load_from_disk(disk_path)
+            if qimg is not None:
+                self._cache_render(key, qimg)
+                return qimg
+
+        page = self._thread_doc()[page_index]
         scale = zoom_level / 100.0
         pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
 
-        img_format = (
-            QImage.Format.Format_RGB888
-            if pix.n == 3
-            else QImage.Format.Format_RGBA8888
-        )
+        gray = self._grayscale_plane(pix)
+        if gray is not None:
+            qimg = _wrap_pixels(
+                gray,
+                gray.data,
+                pix.width,
+                pix.height,
+                pix.width,
+                QImage.Format.Format_Grayscale8,
+            )
+        else:
+            qimg = _wrap_pixels(
+                pix,
+                _pixmap_buffer(pix),
+                pix.width,
+                pix.height,
+                pix.stride,
+                _PIXMAP_FORMATS[pix.n == 3],
+            ).convertToFormat(_DISPLAY_FORMATS[pix.n == 3])
 
-        qimg = QImage(
-            pix.samples,
-            pix.width,
-            pix.height,
-            pix.stride,
-            img_format,
+        if disk_path is not None:
+            self._queue_disk_write(disk_path, qimg)
+        self._cache_render(key, qimg)
+        return qimg
+
+    def _scale_from_master(self, page_index: int, zoom_level: int) -> QImage | None:
+        """Downscales the closest cached render at a higher zoom, if any."""
+        with self._cache_lock:
+            master_zoom = min(
+                (z for p, z in self._render_cache if p == page_index and z > zoom_level),
+                default=None,
+            )
+            if master_zoom is None:
+                return None
+            master = self._render_cache[(page_index, master_zoom)]
+
+        ratio = zoom_level / master_zoom
+        scaled = master.scaled(
+            round(master.width() * ratio),
+            round(master.height() * ratio),
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
         )
+        # Some Qt versions smooth-scale gray pages to 32 bits; keep one byte.
+        if master.format() == QImage.Format.Format_Grayscale8:
+            scaled = scaled.convertToFormat(QImage.Format.Format_Grayscale8)
+        return scaled
+
+    @staticmethod
+    def _grayscale_plane(pix: fitz.Pixmap) -> np.ndarray | None:
+        """Returns one contiguous channel if every pixel has R == G == B."""
+        if pix.n != 3 or pix.alpha:
+            return None
+
+        rows = np.frombuffer(_pixmap_buffer(pix), dtype=np.uint8).reshape(pix.height, pix.stride)
+        rgb = rows[:, :pix.width * 3].reshape(pix.height, pix.width, 3)
 
-        return qimg.copy()
+        # A sparse sample rejects most coloured pages before the full scan.
+        sample = rgb[::64, ::64]
+        if not (
+            np.array_equal(sample[..., 0], sample[..., 1])
+            and np.array_equal(sample[..., 1], sample[..., 2])
+        ):
+            return None
+
+        if not (
+            np.array_equal(rgb[..., 0], rgb[..., 1])
+            and np.array_equal(rgb[..., 1], rgb[..., 2])
+        ):
+            return None
+
+        return np.ascontiguousarray(rgb[..., 0])
 
     def get_character_map(self, page_index: int) -> List[CharMetadata]:
         """Returns a list of characters with bounding boxes."""
         if not self._doc:
             return []
 
-        page = self._doc[page_index]
-        text_data = page.get_text("rawdict")
-
-        chars: List[CharMetadata] = []
-
-        for block in text_data["blocks"]:
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    for char_info in span.get("chars", []):
-                        x0, y0, x1, y1 = char_info["bbox"]
-                        bbox = QRectF(x0, y0, x1 - x0, y1 - y0)
-                        chars.append(
-                            CharMetadata(
-                                char=char_info["c"],
-                                bbox=bbox,
-                            )
-                        )
+        cached = self._cache_get(self._char_map_cache, page_index)
+        if cached is not None:
+            return cached
 
+        chars = _chars_from_textpage(self._ensure_textpage(page_index))
+        self._cache_put(
+            self._char_map_cache, page_index, chars, self.CHAR_MAP_CACHE_SIZE
+        )
         return chars
@@ -0,0 +1,60 @@
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _coalesce_lines_numpy(x0, y0, x1, y1):
+    """Merges consecutive character boxes into one (left, top, right, bottom) per line."""
+    # A new line starts where the top jumps by more than half a glyph
+    # or the text runs backwards (next column).
+    heights = y1 - y0
+    line_break = (np.abs(np.diff(y0)) > heights[1:] / 2) | (x0[1:] < x0[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(line_break) + 1))
+
+    return (
+        np.minimum.reduceat(x0, starts),
+        np.minimum.reduceat(y0, starts),
+        np.maximum.reduceat(x1, starts),
+        np.maximum.reduceat(y1, starts),
+    )
+
+
+def _coalesce_lines_loop(x0, y0, x1, y1):
+    """Same contract as _coalesce_lines_numpy, as a single fused loop for numba."""
+    n = x0.shape[0]
+    lefts = np.empty(n, dtype=x0.dtype)
+    tops = np.empty(n, dtype=y0.dtype)
+    rights = np.empty(n, dtype=x1.dtype)
+    bottoms = np.empty(n, dtype=y1.dtype)
+
+    count = 0
+    left, top, right, bottom = x0[0], y0[0], x1[0], y1[0]
+    for i in range(1, n):
+        half_height = (y1[i] - y0[i]) / 2
+        if abs(y0[i] - y0[i - 1]) > half_height or x0[i] < x0[i - 1]:
+            lefts[count], tops[count] = left, top
+            rights[count], bottoms[count] = right, bottom
+            count += 1
+            left, top, right, bottom = x0[i], y0[i], x1[i], y1[i]
+        else:
+            left = min(left, x0[i])
+            top = min(top, y0[i])
+            right = max(right, x1[i])
+            bottom = max(bottom, y1[i])
+
+    lefts[count], tops[count] = left, top
+    rights[count], bottoms[count] = right, bottom
+    count += 1
+    return lefts[:count], tops[:count], rights[:count], bottoms[:count]
+
+
+# The explicit loop only pays off once compiled; without numba the
+# NumPy reductions are faster than interpreting it.
+if HAS_NUMBA:
+    coalesce_lines = njit(cache=True)(_coalesce_lines_loop)
+else:
+    coalesce_lines = _coalesce_lines_numpy
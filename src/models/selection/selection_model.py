@@ -1,32 +1,217 @@
+import string
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
-from PyQt6.QtCore import QRectF
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF
 
-@dataclass
+from ._kernels import coalesce_lines
+
+WORD_CHARS = "_-'"
+
+# Word-character table for ASCII; other code points go through _is_word_cp.
+_ASCII_WORD = np.zeros(128, dtype=bool)
+_ASCII_WORD[[ord(c) for c in string.ascii_letters + string.digits + WORD_CHARS]] = True
+
+
+@lru_cache(maxsize=None)
+def _is_word_cp(cp: int) -> bool:
+    c = chr(cp)
+    return c.isalnum() or c in WORD_CHARS
+
+
+def _word_mask(text: str) -> np.ndarray:
+    """Marks the word characters of `text`, one entry per code point."""
+    cps = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    ascii = cps < 128
+    mask = np.zeros(len(cps), dtype=bool)
+    mask[ascii] = _ASCII_WORD[cps[ascii]]
+    for i in np.flatnonzero(~ascii):
+        mask[i] = _is_word_cp(int(cps[i]))
+    return mask
+
+
+@dataclass(slots=True)
 class CharMetadata:
-    """Represents a single character and its bounding box."""
+    """Represents a single character and its (x0, y0, x1, y1) box in points."""
     char: str
-    bbox: QRectF
+    rect: Tuple[float, float, float, float]
+
+    @property
+    def bbox(self) -> QRectF:
+        """Builds a QRectF on demand; hot paths should read `rect` instead."""
+        x0, y0, x1, y1 = self.rect
+        return QRectF(x0, y0, x1 - x0, y1 - y0)
+
+
+@dataclass(slots=True)
+class CharBoxArrays:
+    """Struct-of-arrays copy of character boxes: one contiguous array per edge."""
+    x0: np.ndarray
+    y0: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+
+    @classmethod
+    def from_characters(cls, characters: List[CharMetadata], dtype=np.float64) -> "CharBoxArrays":
+        rects = np.array(
+            [c.rect for c in characters], dtype=dtype
+        ).reshape(len(characters), 4)
+        return cls(*(np.ascontiguousarray(rects[:, i]) for i in range(4)))
 
 
 class SelectionModel:
     """Text-domain model for a single page."""
+    SPACE_THRESHOLD = 4.0
+    LINE_THRESHOLD = 5.0
+
     def __init__(self, page_index: int):
         self.page_index = page_index
         self._characters: List[CharMetadata] = []
 
+        # Struct-of-arrays view of the character boxes for vectorized hit-tests.
+        self._x0 = np.empty(0, dtype=np.float32)
+        self._y0 = np.empty(0, dtype=np.float32)
+        self._x1 = np.empty(0, dtype=np.float32)
+        self._y1 = np.empty(0, dtype=np.float32)
+        # The page's glyphs joined, or None when some glyph is not a single
+        # code point and indices would not line up.
+        self._text: Optional[str] = ""
+
+        # Line index: per line, (x0, x1, char indices) sorted by x0.
+        # Built on the first get_char_at.
+        self._lines: Optional[List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = None
+        self._line_tops: List[float] = []
+        self._line_bottoms: List[float] = []
+        self._max_line_height = 0.0
+
+        # Sorted indices k where a word cannot continue from k - 1 to k.
+        # Built on the first word selection.
+        self._word_breaks: Optional[np.ndarray] = None
+
     def set_characters(self, characters: List[CharMetadata]):
         """Sets character metadata for the page."""
         self._characters = characters
 
-    def get_char_at(self, point: QRectF) -> Optional[int]:
-        """Returns the index of the character containing the point."""
-        for i, meta in enumerate(self._characters):
-            if meta.bbox.contains(point):
-                return i
+        n = len(characters)
+        boxes = CharBoxArrays.from_characters(characters, np.float32)
+        self._x0, self._y0, self._x1, self._y1 = boxes.x0, boxes.y0, boxes.x1, boxes.y1
+
+        # Only usable for slicing when every entry is exactly one code point.
+        text = "".join(c.char for c in characters)
+        self._text = text if len(text) == n else None
+
+        self._lines = None
+        self._word_breaks = None
+
+    def _build_line_index(self):
+        """Buckets characters into lines by vertical centre, sorted by x."""
+        self._lines = []
+        self._line_tops = []
+        self._line_bottoms = []
+        self._max_line_height = 0.0
+        if not len(self._x0):
+            return
+
+        centers = (self._y0 + self._y1) / 2
+        tolerance = max(float(np.median(self._y1 - self._y0)) / 2, 1.0)
+
+        order = np.argsort(centers, kind="stable")
+        breaks = np.flatnonzero(np.diff(centers[order]) > tolerance) + 1
+
+        lines = []
+        for group in np.split(order, breaks):
+            group = group[np.argsort(self._x0[group], kind="stable")]
+            top = float(self._y0[group].min())
+            bottom = float(self._y1[group].max())
+            lines.append((top, bottom, group))
+
+        lines.sort(key=lambda line: line[0])
+        for top, bottom, group in lines:
+            self._lines.append((self._x0[group], self._x1[group], group))
+            self._line_tops.append(top)
+            self._line_bottoms.append(bottom)
+            self._max_line_height = max(self._max_line_height, bottom - top)
+
+    def get_char_at(self, point: QPointF, scale: float = 1.0) -> Optional[int]:
+        """
+        Returns the index of the character containing the point.
+        `scale` is the render scale of `point`'s pixel space (RenderResult.scale).
+        """
+        if self._lines is None:
+            self._build_line_index()
+
+        inv = 1.0 / scale
+        px, py = point.x() * inv, point.y() * inv
+
+        # Lines are sorted by top; only those starting within one line
+        # height above the point can still reach down to it.
+        i = bisect_right(self._line_tops, py) - 1
+        while i >= 0 and self._line_tops[i] >= py - self._max_line_height:
+            if py <= self._line_bottoms[i]:
+                hit = self._hit_line(i, px, py)
+                if hit is not None:
+                    return hit
+            i -= 1
         return None
 
+    def _hit_line(self, line: int, px: float, py: float) -> Optional[int]:
+        x0, x1, indices = self._lines[line]
+        j = int(np.searchsorted(x0, px, side="right")) - 1
+
+        # Check the previous glyph too, in case neighbouring boxes overlap.
+        for k in (j, j - 1):
+            if k >= 0 and px <= x1[k]:
+                idx = int(indices[k])
+                if self._y0[idx] <= py <= self._y1[idx]:
+                    return idx
+        return None
+
+    def get_word_bounds(self, char_index: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the (start, end) indices of the word around `char_index`,
+        or None if that character is not part of a word.
+        """
+        n = len(self._characters)
+        if not (0 <= char_index < n) or not self._is_word_char(char_index):
+            return None
+
+        if self._word_breaks is None:
+            self._word_breaks = self._build_word_breaks()
+
+        breaks = self._word_breaks
+        pos = int(np.searchsorted(breaks, char_index, side="right"))
+        start = int(breaks[pos - 1]) if pos > 0 else 0
+        end = int(breaks[pos]) - 1 if pos < len(breaks) else n - 1
+        return start, end
+
+    def _is_word_char(self, index: int) -> bool:
+        c = self._characters[index].char
+        if len(c) == 1:
+            return _is_word_cp(ord(c))
+        return c.isalnum() or c in WORD_CHARS
+
+    def _build_word_breaks(self) -> np.ndarray:
+        if self._text is not None:
+            is_word = _word_mask(self._text)
+        else:
+            is_word = np.fromiter(
+                (self._is_word_char(i) for i in range(len(self._characters))),
+                dtype=bool,
+                count=len(self._characters),
+            )
+        gap = self._x0[1:] - self._x1[:-1]
+        v_gap = np.abs(np.diff(self._y0))
+        mask = (
+            ~is_word[:-1]
+            | ~is_word[1:]
+            | (gap > self.SPACE_THRESHOLD)
+            | (v_gap > self.LINE_THRESHOLD)
+        )
+        return np.flatnonzero(mask) + 1
+
     def get_text_range(self, start_idx: int, end_idx: int) -> str:
         """Returns the concatenated text between two indices."""
         if start_idx > end_idx:
@@ -35,14 +220,43 @@ class SelectionModel:
         start_idx = max(0, start_idx)
         end_idx = min(len(self._characters) - 1, end_idx)
 
+        if self._text is not None:
+            return self._text[start_idx:end_idx + 1]
         return "".join(c.char for c in self._characters[start_idx:end_idx + 1])
 
     def get_bboxes_for_range(self, start_idx: int, end_idx: int) -> List[QRectF]:
-        """Returns bounding boxes for a character range."""
+        """Returns one bounding box per line covered by a character range."""
+        if start_idx > end_idx:
+            start_idx, end_idx = end_idx, start_idx
+
+        span = slice(max(0, start_idx), end_idx + 1)
+        x0, y0 = self._x0[span], self._y0[span]
+        x1, y1 = self._x1[span], self._y1[span]
+        if not len(x0):
+            return []
+
+        lefts, tops, rights, bottoms = (
+            a.tolist() for a in coalesce_lines(x0, y0, x1, y1)
+        )
+
+        return [
+            QRectF(left, top, right - left, bottom - top)
+            for left, top, right, bottom in zip(lefts, tops, rights, bottoms)
+        ]
+
+    def get_range_bounds(self, start_idx: int, end_idx: int) -> Optional[QRectF]:
+        """Returns the box enclosing a character range, or None if it is empty."""
         if start_idx > end_idx:
             start_idx, end_idx = end_idx, start_idx
 
-        return [c.bbox for c in self._characters[start_idx:end_idx + 1]]
+        span = slice(max(0, start_idx), end_idx + 1)
+        x0, y0 = self._x0[span], self._y0[span]
+        if not len(x0):
+            return None
+
+        left, top = float(x0.min()), float(y0.min())
+        right, bottom = float(self._x1[span].max()), float(self._y1[span].max())
+        return QRectF(left, top, right - left, bottom - top)
 
     @property
     def char_count(self) -> int:
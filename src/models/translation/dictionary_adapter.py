@@ -17,6 +17,13 @@ class DictionaryAdapter(ABC):
         """
         pass
 
+    def get_cached(self, term: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns an earlier lookup's result without doing a new lookup.
+        Raises KeyError if `term` has not been looked up.
+        """
+        raise KeyError(term)
+
     @abstractmethod
     def close(self):
         pass
\ No newline at end of file
@@ -1,4 +1,3 @@
-import time
 from typing import Optional, Dict, Any
 from .dictionary_adapter import DictionaryAdapter
 
@@ -1,8 +1,15 @@
 import re
 import html
 import os
-from typing import Optional, Dict, Any
+import string
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, NamedTuple, Pattern
 from .dictionary_adapter import DictionaryAdapter
+from ...utils.logging import get_logger
 
 try:
     from pystardict import Dictionary
@@ -10,6 +17,229 @@ try:
 except ImportError:
     HAS_LIB = False
 
+_logger = get_logger("StarDict")
+
+# Punctuation a drag-selection tends to pick up around a word.
+# Inner hyphens and apostrophes (well-known, don't) are kept.
+_EDGE_CHARS = string.punctuation + string.whitespace + "“”‘’«»…—–"
+# Apostrophes that can open a word: 'tis, '90s.
+_APOSTROPHES = "'’"
+
+
+@lru_cache(maxsize=4096)
+def _normalize_term(term: str) -> str:
+    body = term.rstrip(_EDGE_CHARS)
+    # A leading apostrophe before a letter or digit belongs to the word,
+    # unless a trailing one shows the term was quoted ('word').
+    quoted = any(c in _APOSTROPHES for c in term[len(body):])
+    start = 0
+    while start < len(body) and body[start] in _EDGE_CHARS:
+        if (
+            not quoted
+            and body[start] in _APOSTROPHES
+            and body[start + 1:start + 2].isalnum()
+        ):
+            break
+        start += 1
+    return body[start:]
+
+
+# --- Patterns ---
+# Compiled once at import; lookups call the bound methods directly.
+
+# Redirect detection
+_RE_REDIRECT = re.compile(r'Main\s+entry:.*?<kref>([^<]+)</kref>', re.DOTALL)
+_RE_NUMBERED_MARK = re.compile(r'<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>')
+_RE_MARKUP_TOKEN = re.compile(r'<(/?)([a-z]*)([^>]*)>|[^<]+|<')
+_RE_STRIP_TAGS = re.compile(r'<[^>]+>')
+
+# Entry structure
+_RE_PHONETIC = re.compile(r'<c c="darkcyan">\[(.*?)\]</c>')
+_RE_POS_SPLIT = re.compile(r'<c c="orange">\s*([a-z,\s]+?)\s*</c>')
+_RE_NOISE_MARKERS = re.compile(
+    r'<(?:c|darkslategray)[^>]*>(?:Thesaurus|Example Bank|Word Origin|Idiom|Verb forms|Derived|Word Family|Collocations):',
+    re.IGNORECASE,
+)
+_RE_NUMBERED_DEF = re.compile(
+    r'<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>(.*?)(?=<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>|<blockquote>|$)',
+    re.DOTALL,
+)
+_RE_BLOCKQUOTE = re.compile(r'<blockquote>(.*?)</blockquote>', re.DOTALL)
+_RE_WORD_ORIGIN_LABEL = re.compile(r'Word Origin:', re.IGNORECASE)
+
+# Definition cleanup, numbered as in _clean_definition_text
+_RE_ETC_TILDE = re.compile(r'[a-z]+(?:,\s*[a-z]+)*,?\s+etc\.?\s*~\s*', re.IGNORECASE)
+_RE_PAREN_META = re.compile(
+    r'<c c="darkgray">[^\(]*\(</c>'
+    r'(?:(?!</blockquote>).)*?'
+    r'<c c="darkgray">\)[^\<]*</c>[\s\xa0]*'
+)
+_RE_PAREN_ITALIC_META = re.compile(
+    r'<c c="darkgray">[^\(]*\(</c>'
+    r'<i><c c="darkgray">[^<]*</c></i>\s*'
+    r'<b>[^<]*</b>'
+    r'<c c="darkgray">\)</c>[\s\xa0]*'
+)
+_RE_GRAMMAR_META = re.compile(r'(?:<c c="orangered">[^<]*</c>\s*(?:<c c="darkgray">[^<]*</c>\s*)?)+')
+# Colours whose <c> runs are label metadata and dropped outright.
+_LABEL_COLORS = ("sienna", "green")  # regional markers, subject areas
+_RE_LABELS = re.compile(
+    r'<c c="(?:' + "|".join(_LABEL_COLORS) + r')">[^<]*</c>\s*'
+)
+_RE_BOLD_PLUS = re.compile(r'<b>\s*\+\s*\w+\s*</b>\s*')
+_RE_EQUALS_REF = re.compile(r'<c c="darkcyan"><b>\s*=\s*</b></c>\s*')
+_RE_REGISTER = re.compile(r'<c c="rosybrown">[^<]*</c>\s*')
+_RE_ITALIC_CONTEXT = re.compile(r'<i><c c="[^"]*">[^<]*</c></i>\s*')
+_RE_DARKSLATEGRAY_ITALIC = re.compile(r'<c c="darkslategray"><i>[^<]*</i></c>\s*')
+_RE_DARKSLATEGRAY_ORIGIN = re.compile(
+    r'<c c="darkslategray">(?:<c>)?Word\s*Origin:?(?:</c>)?</c>\s*', re.IGNORECASE
+)
+_RE_DARKSLATEGRAY_MERGE = re.compile(
+    r'<c c="darkslategray">([^<]*)</c>\s*<c c="darkslategray">([^<]*)</c>'
+)
+_RE_DARKSLATEGRAY = re.compile(r'<c c="darkslategray">([^<]*)</c>\s*')
+_METADATA_HEADERS = (
+    'word origin', 'idiom', 'thesaurus', 'example bank',
+    'derived', 'verb forms', 'word family', 'collocations',
+)
+_RE_DIMGRAY = re.compile(r'<c c="dimgray">[^<]*</c>\s*')
+_RE_PARENTHESIZED = re.compile(r'\([^)]*\)')
+_RE_WHITESPACE_CHAR = re.compile(r'\s')
+_RE_ABBR = re.compile(r'\b(?:abbr\.|symb\.)\s*', re.IGNORECASE)
+_RE_LEADING_ABBR_PAREN = re.compile(r'^\s*(?:No\.|Fr)\.?\s*\)\s*')
+_RE_ABBR_PAREN = re.compile(r'\(\s*(?:Fr|No)\.?\s*\)')
+_RE_SYMBOL_PAREN = re.compile(r'\(\s*[#\*]+\s*\)')
+_RE_THESAURUS_PAREN = re.compile(r'^[A-Z]\s+\(')
+_RE_THESAURUS_USAGE = re.compile(r'^[A-Z]\s+(?:followed|used)')
+_RE_WORD_ORIGIN = re.compile(r'Word\s*Origin', re.IGNORECASE)
+_RE_PHONETIC_REF = re.compile(r'\[ðiː\]|z_\w+\.wav', re.IGNORECASE)
+_RE_EXAMPLE_SYMBOL = re.compile(r'^\s*[•↑]')
+_RE_EMPTY_PAREN = re.compile(r'\s*\(\s*\)\s*')
+_RE_LEADING_CLOSE_PAREN = re.compile(r'^\s*\)\s*')
+_RE_ORPHAN_CLOSE_PAREN = re.compile(r'\s*\)\s*(?=\s|$)')
+_RE_SPACES = re.compile(r'\s+')
+_RE_UNCLOSED_PAREN = re.compile(r'\([^)]*$')
+_RE_GRAMMAR_PREFIX_CHAIN = re.compile(
+    r'^(?:(?:noun|verb|adjective|adverb|only|before|usually|'
+    r'always|passive|countable|uncountable|transitive|intransitive|'
+    r'singular|plural|formal|literary|old use|or)\b'
+    r'[\s,/\+]*)+',
+    re.IGNORECASE,
+)
+_RE_CAPS_PREFIX = re.compile(r'^[A-Z\s]{3,}\s+')
+_RE_CAPS_SUFFIX = re.compile(r'\s+[A-Z\s]{3,}$')
+_RE_GRAMMAR_CODES = re.compile(r'^[CUI\s,()\-+/]+$')
+
+
+@lru_cache(maxsize=4096)
+def _variations(word: str) -> tuple[str, ...]:
+    """Candidate headwords for an inflected form, most specific first."""
+    vars = [word]
+    word_l = word.lower()
+    
+    # Add lowercase version if word has uppercase
+    if word != word_l:
+        vars.append(word_l)
+    
+    # -s, -es plurals/verb forms
+    if word_l.endswith('s') and not word_l.endswith('ss'): 
+        vars.append(word[:-1])
+    if word_l.endswith('es'): 
+        vars.append(word[:-2])
+    
+    # -ies → -y (studies → study)
+    if word_l.endswith('ies'): 
+        vars.append(word[:-3] + 'y')
+    
+    # -ed past tense
+    if word_l.endswith('ed'): 
+        vars.append(word[:-2])  # worked → work
+        vars.append(word[:-1])  # bored → bore
+    
+    # -ing present participle
+    if word_l.endswith('ing'): 
+        vars.append(word[:-3])      # working → work
+        vars.append(word[:-3] + 'e')  # speaking → speake (will try speak via -e drop)
+    
+    # -ly adverbs → adjectives
+    if word_l.endswith('ly'):
+        vars.append(word[:-2])  # quickly → quick
+    
+    # -ness nouns → adjectives  
+    if word_l.endswith('ness'):
+        vars.append(word[:-4])  # manliness → manli
+        if word_l.endswith('iness'):
+            vars.append(word[:-5] + 'y')  # happiness → happy
+        if word_l.endswith('liness'):
+            vars.append(word[:-7] + 'ly')  # manliness → manly
+    
+    return tuple(dict.fromkeys(vars))
+
+
+# Tags whose text is metadata or examples rather than a definition.
+_SILENT_TAGS = frozenset(('ex', 'c', 'abr', 'rref', 'k', 'b'))
+
+
+def _plain_len(markup: str, limit: int) -> int:
+    """
+    Length of the stripped text outside examples, coloured metadata and
+    other labels, in one pass. Stops counting once it exceeds `limit`.
+    """
+    silent = []
+    # Length up to the last non-space character; whitespace after it only
+    # counts once more text follows, as with str.strip().
+    length = 0
+    trailing = 0
+    for m in _RE_MARKUP_TOKEN.finditer(markup):
+        tag = m.group(2)
+        if tag is None:
+            if silent:
+                continue
+            text = m.group(0) if length else m.group(0).lstrip()
+            body = text.rstrip()
+            if not body:
+                trailing += len(text)
+                continue
+            length += trailing + len(body)
+            trailing = len(text) - len(body)
+            if length > limit:
+                break
+        elif m.group(1):
+            if silent and silent[-1] == tag:
+                silent.pop()
+        elif tag in _SILENT_TAGS and (tag != 'c' or m.group(3)):
+            # Only coloured <c c="..."> runs are metadata; bare <c> is not.
+            silent.append(tag)
+    return length
+
+
+class _HeadwordPatterns(NamedTuple):
+    bold_noise: Pattern
+    bold: Pattern
+
+
+@lru_cache(maxsize=512)
+def _headword_patterns(headword_lower: str) -> _HeadwordPatterns:
+    """Patterns that embed the headword, compiled once per headword."""
+    word = re.escape(headword_lower)
+    return _HeadwordPatterns(
+        # One pass over <b> runs: the alternatives all end at the same </b>,
+        # so this matches what applying each rule in turn would remove.
+        bold_noise=re.compile(
+            r'<b>(?:'
+            + word + r's?'            # inflected forms (studies, ...)
+            r'|studies'
+            r'|-\w+'                  # -born, ...
+            r'|[^<]*[~/][^<]*'        # good/bad ~
+            r'|(?i:the\s+\w+er)'      # the younger
+            r'|(?i:the\s+' + word + r')'
+            r')</b>\s*'
+            r'|(?i:<b>\s*(?:~|' + word + r')[^<]*</b>)'  # ~ or headword in bold
+        ),
+        bold=re.compile(r'<b>(' + word + r')</b>', re.IGNORECASE),
+    )
+
+
 class StarDictAdapter(DictionaryAdapter):
     """
     T1.3: Real Adapter for StarDict.
@@ -18,6 +248,8 @@ class StarDictAdapter(DictionaryAdapter):
     - Nukes all-caps headers (ART, MUSIC, etc.)
     - Aggressively strips specific grammar noise strings.
     """
+    CACHE_SIZE = 2048
+
     def __init__(self, dict_path_prefix: str):
         if not HAS_LIB:
             raise ImportError("pystardict not installed.")
@@ -27,96 +259,102 @@ class StarDictAdapter(DictionaryAdapter):
             raise FileNotFoundError(f"Dictionary not found at: {dict_path_prefix}")
         
         self._dict = Dictionary(prefix)
+        self._key_by_lower = self._build_key_map()
+        # Lookups run on one worker thread, but get_cached is also called
+        # from the GUI thread, so cache access is serialized.
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict[str, Optional[Dict[str, Any]]] = OrderedDict()
 
     def lookup(self, term: str) -> Optional[Dict[str, Any]]:
-        return self._lookup_internal(term, visited=set())
+        clean_term = _normalize_term(term)
+        if not clean_term:
+            return None
+
+        try:
+            return self._get_cached(clean_term)
+        except KeyError:
+            pass
+
+        result = self._lookup_internal(clean_term, visited=set())
+        with self._cache_lock:
+            self._cache[clean_term] = result
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def get_cached(self, term: str) -> Optional[Dict[str, Any]]:
+        clean_term = _normalize_term(term)
+        if not clean_term:
+            return None
+        return self._get_cached(clean_term)
+
+    def _get_cached(self, clean_term: str) -> Optional[Dict[str, Any]]:
+        # Callers treat results as read-only, so cached dicts are shared.
+        with self._cache_lock:
+            result = self._cache[clean_term]
+            self._cache.move_to_end(clean_term)
+        return result
 
     def _lookup_internal(self, term: str, visited: set) -> Optional[Dict[str, Any]]:
         clean_term = term.strip()
         
         # Prevent circular redirects
         if clean_term.lower() in visited:
-            print(f"DEBUG: Circular redirect detected for '{clean_term}'")
+            _logger.debug("Circular redirect detected for %r", clean_term)
             return None
         visited.add(clean_term.lower())
         
-        variations = self._get_variations(clean_term)
+        variations = self._valid_stems(clean_term)
         
-        print(f"DEBUG: Looking up '{clean_term}'")
-        print(f"DEBUG: Variations: {variations}")
+        _logger.debug("Looking up %r, variations: %s", clean_term, variations)
         
         data_blob = None
         found_word = clean_term
 
         for var in variations:
-            print(f"  Trying: '{var}'")
-            data_blob = self._dict.get(var) if hasattr(self._dict, 'get') else None
-            if not data_blob:
-                try: 
-                    data_blob = self._dict[var]
-                except KeyError: 
-                    pass
-            
+            data_blob = self._dict[var]
             if data_blob:
                 found_word = var
-                print(f"  FOUND with: '{var}'")
+                _logger.debug("Found with %r", var)
                 break
-            else:
-                print(f"  Not found")
         
         if not data_blob:
             return None
 
         return self._parse_oald_blob(found_word, data_blob, visited)
 
-    def _get_variations(self, word: str) -> list[str]:
-        vars = [word]
-        word_l = word.lower()
-        
-        # Add lowercase version if word has uppercase
-        if word != word_l:
-            vars.append(word_l)
-        
-        # -s, -es plurals/verb forms
-        if word_l.endswith('s') and not word_l.endswith('ss'): 
-            vars.append(word[:-1])
-        if word_l.endswith('es'): 
-            vars.append(word[:-2])
-        
-        # -ies → -y (studies → study)
-        if word_l.endswith('ies'): 
-            vars.append(word[:-3] + 'y')
-        
-        # -ed past tense
-        if word_l.endswith('ed'): 
-            vars.append(word[:-2])  # worked → work
-            vars.append(word[:-1])  # bored → bore
-        
-        # -ing present participle
-        if word_l.endswith('ing'): 
-            vars.append(word[:-3])      # working → work
-            vars.append(word[:-3] + 'e')  # speaking → speake (will try speak via -e drop)
-        
-        # -ly adverbs → adjectives
-        if word_l.endswith('ly'):
-            vars.append(word[:-2])  # quickly → quick
-        
-        # -ness nouns → adjectives  
-        if word_l.endswith('ness'):
-            vars.append(word[:-4])  # manliness → manli
-            if word_l.endswith('iness'):
-                vars.append(word[:-5] + 'y')  # happiness → happy
-            if word_l.endswith('liness'):
-                vars.append(word[:-7] + 'ly')  # manliness → manly
-        
-        return list(dict.fromkeys(vars))
-        
+    def _build_key_map(self) -> Dict[str, str]:
+        """Maps each lowercased headword to its spelling in the index."""
+        key_by_lower: Dict[str, str] = {}
+        with warnings.catch_warnings():
+            # Iterating the in-memory .idx is cheap; the warning is about .dict.
+            warnings.simplefilter("ignore")
+            for key in self._dict.idx.keys():
+                key_by_lower.setdefault(key.lower(), key)
+        return key_by_lower
+
+    def _valid_stems(self, word: str) -> list[str]:
+        """
+        Variations of `word` that are actual headwords, in index spelling.
+        Each check is a hash probe; the .dict file is only read for
+        candidates that exist.
+        """
+        stems = []
+        for var in _variations(word):
+            if var not in self._dict:
+                var = self._key_by_lower.get(var.lower())
+                if var is None:
+                    continue
+            if var not in stems:
+                stems.append(var)
+        return stems
+
     def _parse_oald_blob(self, word: str, blob: str, visited: set) -> Dict[str, Any]:
         text = blob.decode('utf-8', errors='ignore') if isinstance(blob, bytes) else str(blob)
         text = html.unescape(text)
         
         # Check for redirect entries - use flexible matching for special chars
-        redirect_match = re.search(r'Main\s+entry:.*?<kref>([^<]+)</kref>', text, re.DOTALL)
+        redirect_match = _RE_REDIRECT.search(text)
         
         # Only follow redirect if this is ONLY a redirect (no substantive definitions)
         if redirect_match:
@@ -124,154 +362,113 @@ class StarDictAdapter(DictionaryAdapter):
             content_before = text[:redirect_pos]
             
             # Check for numbered definitions
-            has_numbered_defs = bool(re.search(r'<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>', content_before))
+            has_numbered_defs = bool(_RE_NUMBERED_MARK.search(content_before))
             
             # Check for actual definition text (not just metadata/examples)
-            # Look for blockquote with text that's not inside <ex>, <c>, or deep nesting
-            temp = re.sub(r'<ex>.*?</ex>', '', content_before, flags=re.DOTALL)  # Remove examples
-            temp = re.sub(r'<c c="[^"]*">.*?</c>', '', temp, flags=re.DOTALL)  # Remove colored metadata
-            temp = re.sub(r'<(?:abr|rref|k|b)>[^<]*</(?:abr|rref|k|b)>', '', temp, flags=re.DOTALL)  # Remove other tags
-            temp = re.sub(r'<[^>]+>', '', temp)  # Remove any remaining tags
-            
-            # Now check if there's meaningful text
-            meaningful_text = temp.strip()
-            has_real_definition = len(meaningful_text) > 20
+            has_real_definition = _plain_len(content_before, 20) > 20
             
             if not has_numbered_defs and not has_real_definition:
                 redirect_word = redirect_match.group(1)
-                print(f"DEBUG: Redirecting '{word}' to '{redirect_word}'")
+                _logger.debug("Redirecting %r to %r", word, redirect_word)
                 return self._lookup_internal(redirect_word, visited)
             else:
-                print(f"DEBUG: Found content before redirect - not following redirect for '{word}'")
+                _logger.debug("Content before redirect, not following it for %r", word)
         
         # Continue with normal parsing...
         phonetic = ""
-        ph_match = re.search(r'<c c="darkcyan">\[(.*?)\]</c>', text)
+        ph_match = _RE_PHONETIC.search(text)
         if ph_match:
             phonetic = f"/{ph_match.group(1)}/"
         
         definitions = []
-        pos_split = re.split(r'<c c="orange">\s*([a-z,\s]+?)\s*</c>', text)
+        seen = set()  # definition texts already in `definitions`
+        pos_split = _RE_POS_SPLIT.split(text)
         
         if len(pos_split) > 1:
             for i in range(1, len(pos_split), 2):
-                raw_pos = pos_split[i].strip().replace(',', '') 
+                # Few distinct tags: intern them so cached results share one copy
+                raw_pos = sys.intern(pos_split[i].strip().replace(',', ''))
                 section_text = pos_split[i+1]
-                self._extract_defs_from_section(section_text, raw_pos, definitions, word)
+                self._extract_defs_from_section(section_text, raw_pos, definitions, seen, word)
         else:
-            self._extract_defs_from_section(text, "entry", definitions, word)
+            self._extract_defs_from_section(text, "entry", definitions, seen, word)
         
         return {"word": word, "phonetic": phonetic, "definitions": definitions}
                     
-    def _extract_defs_from_section(self, text: str, pos: str, defs_list: list, word: str):
-        noise_markers = r'<(?:c|darkslategray)[^>]*>(?:Thesaurus|Example Bank|Word Origin|Idiom|Verb forms|Derived|Word Family|Collocations):'
-        text = re.split(noise_markers, text, flags=re.IGNORECASE)[0]
+    def _extract_defs_from_section(self, text: str, pos: str, defs_list: list, seen: set, word: str):
+        text = _RE_NOISE_MARKERS.split(text)[0]
 
-        if 'Word Origin' in text and word == 'in':
-            print(f"DEBUG AFTER SPLIT: Word Origin still present!")
-            print(f"Text preview: {text[:500]}")
-
-        # Regex for numbers: capture text after number until next number or semantic header
-        pattern = re.compile(
-            r'<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>(.*?)(?=<c c="(?:red|darkmagenta)"><b>\d+\.</b></c>|<blockquote>|$)', 
-            re.DOTALL
-        )
-        matches = pattern.findall(text)
+        # Capture text after each number until the next number or semantic header
+        matches = _RE_NUMBERED_DEF.findall(text)
         
         if matches:
             for raw_def in matches:
-                if 'Word Origin' in raw_def:
-                    print(f"DEBUG EXTRACT: Found Word Origin in raw_def")
-                    print(f"Raw content: {raw_def[:200]}")
                 # Skip Word Origin sections
-                if re.search(r'Word Origin:', raw_def, re.IGNORECASE):
+                if _RE_WORD_ORIGIN_LABEL.search(raw_def):
                     continue
                 clean_def = self._clean_definition_text(raw_def, word)
                 if clean_def and len(clean_def) >= 3:
-                    if not any(d['text'] == clean_def for d in defs_list):
+                    if clean_def not in seen:
+                        seen.add(clean_def)
                         defs_list.append({"pos": pos, "text": clean_def})
         else:
-            fallback_pattern = re.compile(r'<blockquote>(.*?)</blockquote>', re.DOTALL)
-            fallback_match = fallback_pattern.search(text)
+            fallback_match = _RE_BLOCKQUOTE.search(text)
             if fallback_match:
                 raw_content = fallback_match.group(1)
                 # Skip Word Origin sections
-                if re.search(r'Word Origin:', raw_content, re.IGNORECASE):
+                if _RE_WORD_ORIGIN_LABEL.search(raw_content):
                     return
                 clean_def = self._clean_definition_text(raw_content, word)
                 if clean_def:
+                    seen.add(clean_def)
                     defs_list.append({"pos": pos, "text": clean_def})
 
     def _clean_definition_text(self, raw_html: str, headword: str) -> str:
-        # 1. Strip bold inflected forms (studies, -born, etc.)
-        cleaned = re.sub(r'<b>' + re.escape(headword.lower()) + r's?</b>\s*', '', raw_html)
-        cleaned = re.sub(r'<b>studies</b>\s*', '', cleaned)
-        cleaned = re.sub(r'<b>-\w+</b>\s*', '', cleaned)
+        hw = _headword_patterns(headword.lower())
 
-        # 2. Strip usage patterns like "good/bad ~", "the younger", "the + word"
-        cleaned = re.sub(r'<b>[^<]*[~/][^<]*</b>\s*', '', cleaned)
-        cleaned = re.sub(r'<b>the\s+\w+er</b>\s*', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'<b>the\s+' + re.escape(headword) + r'</b>\s*', '', cleaned, flags=re.IGNORECASE)
-        
-        # 3. Strip usage tildes/headwords in bold
-        cleaned = re.sub(r'<b>\s*(?:~|' + re.escape(headword) + r')[^<]*</b>', '', cleaned, flags=re.IGNORECASE)
+        # 1-3. Strip bold inflected forms (studies, -born, etc.), usage
+        # patterns like "good/bad ~", "the younger", "the + word", and
+        # usage tildes/headwords in bold
+        cleaned = hw.bold_noise.sub('', raw_html)
         
         # 3b. Strip usage patterns like "go, come, try, stay, etc. ~" (without bold tags)
-        cleaned = re.sub(r'[a-z]+(?:,\s*[a-z]+)*,?\s+etc\.?\s*~\s*', '', cleaned, flags=re.IGNORECASE)
+        cleaned = _RE_ETC_TILDE.sub('', cleaned)
         
         # 4. Strip entire parenthetical metadata blocks
         # Pattern handles: (BrE, law) or (NAmE, informal) etc.
         # NOTE: May have space/nbsp before opening paren
-        cleaned = re.sub(
-            r'<c c="darkgray">[^\(]*\(</c>'
-            r'(?:(?!</blockquote>).)*?'
-            r'<c c="darkgray">\)[^\<]*</c>[\s\xa0]*',
-            '', cleaned
-        )
+        cleaned = _RE_PAREN_META.sub('', cleaned)
         
         # 4b. Strip parenthetical with italic metadata like "(often the Government)"
-        cleaned = re.sub(
-            r'<c c="darkgray">[^\(]*\(</c>'
-            r'<i><c c="darkgray">[^<]*</c></i>\s*'
-            r'<b>[^<]*</b>'
-            r'<c c="darkgray">\)</c>[\s\xa0]*',
-            '', cleaned
-        )
+        cleaned = _RE_PAREN_ITALIC_META.sub('', cleaned)
         
         # 5. Strip grammatical metadata sequences
-        cleaned = re.sub(r'(?:<c c="orangered">[^<]*</c>\s*(?:<c c="darkgray">[^<]*</c>\s*)?)+', '', cleaned)
-        
-        # 6. Strip remaining regional markers (BrE, NAmE, especially BrE, etc.)
-        cleaned = re.sub(r'<c c="sienna">[^<]*</c>\s*', '', cleaned)
+        cleaned = _RE_GRAMMAR_META.sub('', cleaned)
         
-        # 6b. Strip remaining subject area markers (law, computing, biology, etc.)
-        cleaned = re.sub(r'<c c="green">[^<]*</c>\s*', '', cleaned)
+        # 6. Strip remaining regional (BrE, NAmE, etc.) and subject area
+        # (law, computing, biology, etc.) markers
+        cleaned = _RE_LABELS.sub('', cleaned)
 
-        # 6c. Clean up orphaned commas and spaces left after metadata removal
-        text_so_far = re.sub(r'<[^>]+>', '', cleaned)  # Preview without tags
-        cleaned_preview = re.sub(r'^\s*[,\s]+', '', text_so_far)  # Check what we'd get
-        
         # 7. Strip grammatical patterns like "+ noun"
-        cleaned = re.sub(r'<b>\s*\+\s*\w+\s*</b>\s*', '', cleaned)
+        cleaned = _RE_BOLD_PLUS.sub('', cleaned)
         
         # 8. Strip equals sign references (= bubolic plague)
-        cleaned = re.sub(r'<c c="darkcyan"><b>\s*=\s*</b></c>\s*', '', cleaned)
+        cleaned = _RE_EQUALS_REF.sub('', cleaned)
         
         # 9. Strip register/style metadata
-        cleaned = re.sub(r'<c c="rosybrown">[^<]*</c>\s*', '', cleaned)
+        cleaned = _RE_REGISTER.sub('', cleaned)
         
         # 10. Strip usage context in italics (in any color tag)
-        cleaned = re.sub(r'<i><c c="[^"]*">[^<]*</c></i>\s*', '', cleaned)
-        cleaned = re.sub(r'<c c="darkslategray"><i>[^<]*</i></c>\s*', '', cleaned)
+        cleaned = _RE_ITALIC_CONTEXT.sub('', cleaned)
+        cleaned = _RE_DARKSLATEGRAY_ITALIC.sub('', cleaned)
 
         # 11. Strip Word Origin
-        cleaned = re.sub(r'<c c="darkslategray">(?:<c>)?Word\s*Origin:?(?:</c>)?</c>\s*', '', cleaned, flags=re.IGNORECASE)
+        cleaned = _RE_DARKSLATEGRAY_ORIGIN.sub('', cleaned)
         
         # 12. Process darkslategray content intelligently
         # First, merge consecutive darkslategray tags into single tags
         while True:
-            new_cleaned = re.sub(
-                r'<c c="darkslategray">([^<]*)</c>\s*<c c="darkslategray">([^<]*)</c>',
+            new_cleaned = _RE_DARKSLATEGRAY_MERGE.sub(
                 r'<c c="darkslategray">\1\2</c>',
                 cleaned
             )
@@ -286,79 +483,71 @@ class StarDictAdapter(DictionaryAdapter):
             if len(content) < 3:
                 return ''
             # Remove if it's a known metadata header
-            if re.match(r'^(Word Origin|Idiom|Thesaurus|Example Bank|Derived|Verb forms|Word Family|Collocations)', content, re.IGNORECASE):
+            if content[:20].lower().startswith(_METADATA_HEADERS):
                 return ''
             # Keep everything else (it's likely part of the definition)
             return content + ' '
 
-        cleaned = re.sub(r'<c c="darkslategray">([^<]*)</c>\s*', filter_darkslategray, cleaned)
+        cleaned = _RE_DARKSLATEGRAY.sub(filter_darkslategray, cleaned)
         
         # 13. Strip dimgray content (thesaurus usage notes)
-        cleaned = re.sub(r'<c c="dimgray">[^<]*</c>\s*', '', cleaned)
+        cleaned = _RE_DIMGRAY.sub('', cleaned)
         
         # 14. Remove bold tags from middle of text (keep the word itself)
-        cleaned = re.sub(r'<b>(' + re.escape(headword) + r')</b>', r'\1', cleaned, flags=re.IGNORECASE)
+        cleaned = hw.bold.sub(r'\1', cleaned)
         
         # 15. Strip parentheses containing only stripped tag remnants
-        cleaned = re.sub(r'\([^)]*\)', lambda m: '' if not re.sub(r'\s', '', m.group(0)[1:-1]) else m.group(0), cleaned)
+        cleaned = _RE_PARENTHESIZED.sub(lambda m: '' if not _RE_WHITESPACE_CHAR.sub('', m.group(0)[1:-1]) else m.group(0), cleaned)
         
         # 16. Strip all remaining tags
-        text = re.sub(r'<[^>]+>', '', cleaned).strip()
+        text = _RE_STRIP_TAGS.sub('', cleaned).strip()
 
         # 17. Clean up abbreviation markers and symbols
-        text = re.sub(r'\b(?:abbr\.|symb\.)\s*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'^\s*(?:No\.|Fr)\.?\s*\)\s*', '', text)
-        text = re.sub(r'\(\s*(?:Fr|No)\.?\s*\)', '', text)
-        text = re.sub(r'\(\s*[#\*]+\s*\)', '', text)
+        text = _RE_ABBR.sub('', text)
+        text = _RE_LEADING_ABBR_PAREN.sub('', text)
+        text = _RE_ABBR_PAREN.sub('', text)
+        text = _RE_SYMBOL_PAREN.sub('', text)
         
         # 18. Reject thesaurus entries
-        if re.match(r'^[A-Z]\s+\(', text) or re.match(r'^[A-Z]\s+(?:followed|used)', text):
+        if _RE_THESAURUS_PAREN.match(text) or _RE_THESAURUS_USAGE.match(text):
             return ""
         
         # 19. Reject "Word Origin:" artifacts
-        if re.search(r'Word\s*Origin', text, re.IGNORECASE):
+        if _RE_WORD_ORIGIN.search(text):
             return ""
         
         # 20. Reject phonetic definitions (contains phonetic symbols and audio refs)
-        if re.search(r'\[ðiː\]|z_\w+\.wav', text, re.IGNORECASE):
+        if _RE_PHONETIC_REF.search(text):
             return ""
         
         # 21. Structural Reject: Examples/Thesaurus symbols
-        if re.search(r'^\s*[•↑]', text):
+        if _RE_EXAMPLE_SYMBOL.search(text):
             return ""
 
         # 22. Remove orphaned or empty parentheses
-        text = re.sub(r'\s*\(\s*\)\s*', ' ', text)
-        text = re.sub(r'^\s*\)\s*', '', text)
-        text = re.sub(r'\s*\)\s*(?=\s|$)', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _RE_EMPTY_PAREN.sub(' ', text)
+        text = _RE_LEADING_CLOSE_PAREN.sub('', text)
+        text = _RE_ORPHAN_CLOSE_PAREN.sub(' ', text)
+        text = _RE_SPACES.sub(' ', text).strip()
         
         # 23. Fix unbalanced parentheses
-        text = re.sub(r'\([^)]*$', '', text)
-        text = re.sub(r'^\s*\)\s*', '', text)
+        text = _RE_UNCLOSED_PAREN.sub('', text)
+        text = _RE_LEADING_CLOSE_PAREN.sub('', text)
         text = text.strip()
         
-        # 24. Recursive Grammar Prefix Strip (but exclude words that can be definitions)
-        grammar_noise = (
-            r'^(noun|verb|adjective|adverb|only|before|usually|'
-            r'always|passive|countable|uncountable|transitive|intransitive|'
-            r'singular|plural|formal|literary|old use|or)\b'
-        )
-        while True:
-            new_text = re.sub(grammar_noise + r'[\s,/\+]*', '', text, flags=re.IGNORECASE).strip()
-            if new_text == text:
-                break
-            text = new_text
+        # 24. Grammar Prefix Strip, all stacked prefixes in one match
+        # (but exclude words that can be definitions)
+        text = _RE_GRAMMAR_PREFIX_CHAIN.sub('', text, count=1).strip()
         
         # 25. Strip ALL CAPS headers
-        text = re.sub(r'^[A-Z\s]{3,}\s+', '', text)
-        text = re.sub(r'\s+[A-Z\s]{3,}$', '', text)
+        text = _RE_CAPS_PREFIX.sub('', text)
+        text = _RE_CAPS_SUFFIX.sub('', text)
         
         # 26. Final Polish
         text = text.replace('↑', '').strip()
         
         # 27. Validation (lowered threshold for short but valid definitions)
-        if len(text) < 3 or re.match(r'^[CUI\s,()\-+/]+$', text):
+        if len(text) < 3 or _RE_GRAMMAR_CODES.match(text):
             return ""
         
         # 28. Fix casing
@@ -368,4 +557,6 @@ class StarDictAdapter(DictionaryAdapter):
         return text.strip()
 
     def close(self):
+        with self._cache_lock:
+            self._cache.clear()
         self._dict = None
\ No newline at end of file
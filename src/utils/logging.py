@@ -1,5 +1,7 @@
 import logging
+import logging.handlers
 import os
+import queue
 from pathlib import Path
 from typing import Optional
 
@@ -7,12 +9,17 @@ from typing import Optional
 LOG_DIR = Path(os.path.expanduser("~/.local/share/reader-app/logs"))
 LOG_FILE = LOG_DIR / "app.log"
 
+_listener: Optional[logging.handlers.QueueListener] = None
+
 def setup_logging() -> None:
     """
     Initializes the logging system.
     Creates the directory structure if it doesn't exist.
-    Configures the root logger to write to file.
+    Configures the root logger to hand records to a background thread,
+    which writes them to file, so logging never blocks the UI on disk I/O.
     """
+    global _listener
+
     # Ensure log directory exists
     try:
         LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -21,20 +28,35 @@ def setup_logging() -> None:
         return
 
     # Spec 9.2.2 Configuration
-    logging.basicConfig(
-        filename=str(LOG_FILE),
-        level=logging.INFO,  # Default to INFO as per spec
-        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-        filemode='a'  # Append mode
+    file_handler = logging.FileHandler(str(LOG_FILE), mode='a')  # Append mode
+    file_handler.setFormatter(
+        logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s')
     )
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)  # Default to INFO as per spec
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
     
     # log immediate startup event
     logging.getLogger("System").info(f"Logging initialized at {LOG_FILE}")
 
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 def get_logger(name: str) -> logging.Logger:
     """Returns a named logger instance."""
     return logging.getLogger(name)
 
+_REDACTED_TEMPLATE = "[REDACTED: %d chars]"
+
 def sanitize_for_log(text: str, max_len: int = 20) -> str:
     """
     Spec 11.5.2: Sanitize text for logging.
@@ -42,8 +64,6 @@ def sanitize_for_log(text: str, max_len: int = 20) -> str:
     """
     if text is None:
         return "[NONE]"
-        
-    if len(text) <= max_len:
-        return "[REDACTED]"
-    
-    return f"[REDACTED: {len(text)} chars]"
\ No newline at end of file
+
+    n = len(text)
+    return "[REDACTED]" if n <= max_len else _REDACTED_TEMPLATE % n
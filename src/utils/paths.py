@@ -0,0 +1,5 @@
+import os
+from pathlib import Path
+
+# Per-user cache root; safe to delete at any time.
+CACHE_DIR = Path(os.path.expanduser("~/.cache/reader-app"))
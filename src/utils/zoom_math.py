@@ -0,0 +1,19 @@
+def compute_zoom_step(
+    old_zoom: int,
+    delta: int,
+    anchor_y: int,
+    cursor_y: int,
+    min_zoom: int,
+    max_zoom: int,
+) -> tuple[int, int]:
+    """
+    Applies a wheel delta (120 per notch, 10% per notch) to `old_zoom`.
+    Returns the clamped zoom and the scroll value that keeps the document
+    point `anchor_y` under the cursor.
+    """
+    new_zoom = int(old_zoom + (delta / 120.0) * 10)
+    new_zoom = max(min_zoom, min(max_zoom, new_zoom))
+
+    if old_zoom <= 0:
+        return new_zoom, anchor_y - cursor_y
+    return new_zoom, int(anchor_y * (new_zoom / old_zoom) - cursor_y)
@@ -1,106 +1,221 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QImage
 from ..models.documents.pdf_parser import PdfParser
 from ..models.selection.selection_model import SelectionModel
 from ..utils.logging import get_logger
 
 
 class DocumentViewModel(QObject):
+    WARMUP_PAGES = 8
+    RENDER_WORKERS = 2
+
     document_loaded = pyqtSignal(list)
-    page_rendered = pyqtSignal(int, QImage, int)
+    # Typed as object so receivers get the parser's QImage wrapper itself:
+    # gray renders wrap a NumPy plane that the wrapper keeps alive (see
+    # PdfParser.render_page).
+    page_rendered = pyqtSignal(int, object, int)
     load_failed = pyqtSignal(str)
+    selection_model_ready = pyqtSignal(int)
 
     def __init__(self):
         super().__init__()
         self._logger = get_logger("DocumentVM")
         self._parser = PdfParser()
-        self._executor = ThreadPoolExecutor(max_workers=2)
 
-        self._active_tasks: dict[int, asyncio.Task] = {}
         self._current_zoom = 100
 
+        # Render requests: latest zoom wanted per page, served by a few
+        # long-lived workers from a queue ordered by distance to the viewport.
+        self._pending_renders: dict[int, int] = {}
+        self._render_queue: asyncio.PriorityQueue | None = None
+        self._render_workers: list[asyncio.Task] = []
+        self._render_seq = 0
+        self._focus_page = 0.0
+        # Bumped per load; renders started for an earlier document are dropped.
+        self._generation = 0
+
         self._selection_models: dict[int, SelectionModel] = {}
+        self._selection_tasks: dict[int, asyncio.Task] = {}
+        self._selection_loader: asyncio.Task | None = None
 
     def load_document(self, file_path: str):
-        """Loads the document and pre-calculates character maps."""
+        """
+        Loads the document and publishes its layout right away.
+        Selection models follow in the background; see selection_model_ready.
+        """
         try:
-            self._parser.load(file_path)
-            count = self._parser.get_page_count()
-
-            page_sizes = []
+            self._cancel_selection_builds()
             self._selection_models.clear()
+            self._drop_pending_renders()
 
-            self._logger.info(f"Processing {count} pages for selection layout...")
-
-            for i in range(count):
-                page_sizes.append(self._parser.get_page_size(i, 100))
-
-                char_data = self._parser.get_character_map(i)
-
-                model = SelectionModel(i)
-                model.set_characters(char_data)
-                self._selection_models[i] = model
+            self._parser.load(file_path)
+            count = self._parser.get_page_count()
+            self._parser.warmup(range(min(self.WARMUP_PAGES, count)))
 
+            page_sizes = [self._parser.get_page_size(i, 100) for i in range(count)]
             self.document_loaded.emit(page_sizes)
-            self._logger.info(
-                f"Loaded document: {count} pages with full selection maps"
+
+            self._selection_loader = asyncio.ensure_future(
+                self._build_selection_models(count)
             )
+            self._logger.info(f"Loaded document: {count} pages")
 
         except Exception as e:
             self._logger.error(f"Load error: {e}")
             self.load_failed.emit(str(e))
 
-    def get_selection_model(self, page_index: int) -> SelectionModel:
-        """Returns the SelectionModel for a page."""
+    async def _build_selection_models(self, count: int):
+        """Builds selection models in page order, one at a time."""
+        for i in range(count):
+            task = self._ensure_selection_model(i)
+            if task is not None:
+                await task
+        self._logger.info(f"Selection maps ready for {count} pages")
+
+    def _ensure_selection_model(self, page_index: int) -> asyncio.Task | None:
+        """Schedules a page's selection model unless it is built or pending."""
+        if page_index in self._selection_models:
+            return None
+
+        task = self._selection_tasks.get(page_index)
+        if task is None:
+            task = asyncio.ensure_future(self._build_selection_model(page_index))
+            self._selection_tasks[page_index] = task
+        return task
+
+    async def _build_selection_model(self, page_index: int):
+        try:
+            char_data = await self._parser.get_character_map_async(page_index)
+
+            model = SelectionModel(page_index)
+            model.set_characters(char_data)
+            self._selection_models[page_index] = model
+            self.selection_model_ready.emit(page_index)
+        except Exception as e:
+            self._logger.warning(
+                f"Failed to build selection map for page {page_index}: {e}"
+            )
+        finally:
+            # A build cancelled by a reload finishes after the new document
+            # may have scheduled this page again; leave that entry alone.
+            if self._selection_tasks.get(page_index) is asyncio.current_task():
+                del self._selection_tasks[page_index]
+
+    def _cancel_selection_builds(self):
+        if self._selection_loader is not None:
+            self._selection_loader.cancel()
+            self._selection_loader = None
+        for task in self._selection_tasks.values():
+            task.cancel()
+        self._selection_tasks.clear()
+
+    def get_selection_model(self, page_index: int) -> SelectionModel | None:
+        """Returns the SelectionModel for a page, or None if not built yet."""
         return self._selection_models.get(page_index)
 
     def set_zoom(self, zoom_level: int):
+        if zoom_level != self._current_zoom:
+            self._parser.cancel_prefetch()
         self._current_zoom = zoom_level
 
-    async def request_page(self, page_index: int, zoom_level: int):
-        """Renders a page asynchronously."""
-        if page_index in self._active_tasks:
-            self._active_tasks[page_index].cancel()
-
-        task = asyncio.create_task(
-            self._render_page_internal(page_index, zoom_level)
+    def request_pages(self, requests: list[tuple[int, int]]):
+        """Queues a batch of (page_index, zoom_level) renders in order."""
+        for page_index, zoom_level in requests:
+            self.request_page(page_index, zoom_level)
+
+    def request_page(self, page_index: int, zoom_level: int):
+        """Queues a page render, nearest to the viewport first."""
+        # Visible pages get their selection map ahead of the background pass.
+        self._ensure_selection_model(page_index)
+
+        # Served from memory: no executor round trip.
+        image = self._parser.get_cached_render(page_index, zoom_level)
+        if image is not None:
+            self.page_rendered.emit(page_index, image, zoom_level)
+            return
+
+        if self._pending_renders.get(page_index) == zoom_level:
+            return
+        self._pending_renders[page_index] = zoom_level
+
+        self._ensure_render_workers()
+        self._enqueue_render(page_index, zoom_level)
+
+    def _enqueue_render(self, page_index: int, zoom_level: int):
+        self._render_seq += 1
+        self._render_queue.put_nowait(
+            (abs(page_index - self._focus_page), self._render_seq, page_index, zoom_level)
         )
-        self._active_tasks[page_index] = task
 
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
-        finally:
-            if page_index in self._active_tasks:
-                del self._active_tasks[page_index]
+    def _ensure_render_workers(self):
+        # Created on first use, once the event loop is running.
+        if self._render_workers:
+            return
+        self._render_queue = asyncio.PriorityQueue()
+        self._render_workers = [
+            asyncio.ensure_future(self._render_worker())
+            for _ in range(self.RENDER_WORKERS)
+        ]
+
+    async def _render_worker(self):
+        while True:
+            _, _, page_index, zoom_level = await self._render_queue.get()
+
+            # Superseded by a newer zoom, or dropped by cancel_obsolete_renders.
+            if self._pending_renders.get(page_index) != zoom_level:
+                continue
+            del self._pending_renders[page_index]
+
+            image = self._parser.get_cached_render(page_index, zoom_level)
+            if image is not None:
+                self.page_rendered.emit(page_index, image, zoom_level)
+                continue
+
+            await self._render_page_internal(page_index, zoom_level)
 
     async def _render_page_internal(self, page_index: int, zoom_level: int):
-        loop = asyncio.get_running_loop()
+        generation = self._generation
         try:
-            image = await loop.run_in_executor(
-                self._executor,
-                self._parser.render_page,
+            result = await self._parser.render_page_async(
                 page_index,
                 zoom_level,
             )
-            if image:
-                self.page_rendered.emit(page_index, image, zoom_level)
+            if generation != self._generation:
+                return  # Rendered from the previous document
+            if result:
+                self.page_rendered.emit(page_index, result.image, zoom_level)
         except Exception as e:
             self._logger.warning(
                 f"Failed to render page {page_index}: {e}"
             )
 
+    def _drop_pending_renders(self):
+        self._generation += 1
+        self._pending_renders.clear()
+        if self._render_queue is not None:
+            while not self._render_queue.empty():
+                self._render_queue.get_nowait()
+
     def cancel_obsolete_renders(self, keep_indices: set[int]):
-        to_cancel = set(self._active_tasks.keys()) - keep_indices
-        for page_index in to_cancel:
-            if page_index in self._active_tasks:
-                self._active_tasks[page_index].cancel()
+        """Drops queued renders outside `keep_indices` and re-ranks the rest."""
+        for page_index in list(self._pending_renders):
+            if page_index not in keep_indices:
+                del self._pending_renders[page_index]
+
+        if keep_indices:
+            self._focus_page = (min(keep_indices) + max(keep_indices)) / 2
+
+        if self._render_queue is None:
+            return
+        while not self._render_queue.empty():
+            self._render_queue.get_nowait()
+        for page_index, zoom_level in self._pending_renders.items():
+            self._enqueue_render(page_index, zoom_level)
 
     def close(self):
-        for task in self._active_tasks.values():
+        for task in self._render_workers:
             task.cancel()
-        self._executor.shutdown(wait=False)
+        self._render_workers.clear()
+        self._pending_renders.clear()
+        self._cancel_selection_builds()
         self._parser.close()
@@ -1,5 +1,5 @@
 import re
-from typing import Optional, List, Dict
+from typing import Optional, List
 from PyQt6.QtCore import QObject, pyqtSignal, QRectF
 from ..models.selection.selection_model import SelectionModel
 
@@ -10,79 +10,60 @@ class SelectionViewModel(QObject):
 
     def __init__(self):
         super().__init__()
-        self._page_models: Dict[int, SelectionModel] = {}
+        # Indexed by page; pages are contiguous from 0.
+        self._page_models: List[Optional[SelectionModel]] = []
         self._active_page: Optional[int] = None
 
         self._start_idx: Optional[int] = None
         self._end_idx: Optional[int] = None
 
+    def reset_pages(self, page_count: int):
+        """Drops all page models, sizing the table for a new document."""
+        self._page_models = [None] * page_count
+        self._active_page = None
+        self._start_idx = None
+        self._end_idx = None
+
     def register_page_model(self, page_index: int, model: SelectionModel):
+        if page_index >= len(self._page_models):
+            self._page_models.extend([None] * (page_index + 1 - len(self._page_models)))
         self._page_models[page_index] = model
 
+    def _model_for(self, page_index: Optional[int]) -> Optional[SelectionModel]:
+        if page_index is not None and 0 <= page_index < len(self._page_models):
+            return self._page_models[page_index]
+        return None
+
     def start_selection(self, page_index: int, char_index: int):
         self._active_page = page_index
         self._start_idx = char_index
         self._end_idx = char_index
 
     def update_selection(self, char_index: int):
-        if self._start_idx is not None:
-            self._end_idx = char_index
-            self._emit_current_selection()
+        if self._start_idx is None:
+            return
+        # Drags report the same character many times; only changes matter.
+        if char_index == self._end_idx and char_index != self._start_idx:
+            return
+        self._end_idx = char_index
+        self._emit_current_selection()
 
     def select_word_at(self, page_index: int, char_index: int):
         """Expands a character index into a word selection."""
-        model = self._page_models.get(page_index)
+        model = self._model_for(page_index)
         if not model:
             return
 
-        chars = model._characters
-        if not (0 <= char_index < len(chars)):
+        if not (0 <= char_index < model.char_count):
             return
 
-        def is_word_char(c: str) -> bool:
-            return c.isalnum() or c in "_-'"
-
-        SPACE_THRESHOLD = 4.0
-        LINE_THRESHOLD = 5.0
-
-        if not is_word_char(chars[char_index].char):
+        bounds = model.get_word_bounds(char_index)
+        if bounds is None:
             self.start_selection(page_index, char_index)
             self.update_selection(char_index)
             return
 
-        start = char_index
-        end = char_index
-
-        while start > 0:
-            curr = chars[start]
-            prev = chars[start - 1]
-
-            gap = curr.bbox.left() - prev.bbox.right()
-            v_gap = abs(curr.bbox.top() - prev.bbox.top())
-
-            if (
-                not is_word_char(prev.char)
-                or gap > SPACE_THRESHOLD
-                or v_gap > LINE_THRESHOLD
-            ):
-                break
-            start -= 1
-
-        while end < len(chars) - 1:
-            curr = chars[end]
-            next_char = chars[end + 1]
-
-            gap = next_char.bbox.left() - curr.bbox.right()
-            v_gap = abs(next_char.bbox.top() - curr.bbox.top())
-
-            if (
-                not is_word_char(next_char.char)
-                or gap > SPACE_THRESHOLD
-                or v_gap > LINE_THRESHOLD
-            ):
-                break
-            end += 1
-
+        start, end = bounds
         self.start_selection(page_index, start)
         self.update_selection(end)
 
@@ -94,7 +75,7 @@ class SelectionViewModel(QObject):
         ):
             return
 
-        model = self._page_models.get(self._active_page)
+        model = self._model_for(self._active_page)
         if not model:
             return
 
@@ -109,13 +90,25 @@ class SelectionViewModel(QObject):
         if page_index != self._active_page or self._start_idx is None:
             return []
 
-        model = self._page_models.get(page_index)
+        model = self._model_for(page_index)
         return (
             model.get_bboxes_for_range(self._start_idx, self._end_idx)
             if model
             else []
         )
 
+    def get_selection_bounds(self, page_index: int) -> Optional[QRectF]:
+        """Returns the box enclosing the whole selection on a page."""
+        if page_index != self._active_page or self._start_idx is None:
+            return None
+
+        model = self._model_for(page_index)
+        return (
+            model.get_range_bounds(self._start_idx, self._end_idx)
+            if model
+            else None
+        )
+
     def clear_selection(self):
         self._active_page = None
         self._start_idx = None
@@ -1,5 +1,6 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from ..models.translation.dictionary_adapter import DictionaryAdapter
@@ -7,6 +8,17 @@ from ..models.translation.stardict_adapter import StarDictAdapter
 from ..models.translation.fake_dictionary import FakeDictionary
 from ..utils.logging import get_logger
 
+
+def _resolve(fut: asyncio.Future, result, error: Exception | None):
+    """Completes a lookup future on its loop unless it was cancelled."""
+    if fut.done():
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
 class TranslationViewModel(QObject):
     lookup_started = pyqtSignal(str)
     lookup_success = pyqtSignal(dict)
@@ -19,51 +31,117 @@ class TranslationViewModel(QObject):
         # YOUR DICTIONARY PATH
         # Note: We omit the extension (.ifo, .dict.dz) as pystardict adds it automatically
         STARDICT_PATH = "/usr/share/stardict/dic/oald/Oxford_Advanced_Learner_s_Dictionary"
-        
-        try:
-            self._adapter = StarDictAdapter(STARDICT_PATH)
-            self._logger.info(f"Loaded StarDict: {STARDICT_PATH}")
-        except Exception as e:
-            self._logger.warning(f"StarDict load failed ({e}). Using FakeDictionary fallback.")
-            self._adapter = FakeDictionary()
-            
-        self._executor = ThreadPoolExecutor(max_workers=1)
-        self._current_task: asyncio.Task = None
+
+        # One long-lived lookup thread owns the adapter. It loads the
+        # dictionary first, so startup doesn't wait for it, then serves
+        # (term, loop, future) requests in order; None stops it.
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        # Set by the worker once loaded; repeat lookups read its cache.
+        self._adapter: DictionaryAdapter | None = None
+        self._inflight: asyncio.Future | None = None
+        self._worker = threading.Thread(
+            target=self._serve, args=(STARDICT_PATH,), name="DictionaryLookup", daemon=True
+        )
+        self._worker.start()
+        self._req_id = 0
+        self._pending_term: str | None = None
 
     async def lookup(self, term: str):
-        if self._current_task and not self._current_task.done():
-            self._current_task.cancel()
-        
-        if not term or len(term.strip()) == 0:
+        # Blank selections (e.g. a click outside text) leave the lookup in
+        # flight alone.
+        term = term.strip() if term else ""
+        if not term:
             return
 
+        if term == self._pending_term:
+            self.lookup_started.emit(term)
+            return  # The lookup in flight answers this one too
+
+        # Supersedes any lookup in flight: the worker skips it if it hasn't
+        # started, and a result already on its way is dropped.
+        if self._inflight is not None:
+            self._inflight.cancel()
+        self._req_id += 1
+        req_id = self._req_id
+
         self.lookup_started.emit(term)
-        
-        self._current_task = asyncio.create_task(self._lookup_internal(term))
-        
+
+        self._pending_term = term
         try:
-            await self._current_task
-        except asyncio.CancelledError:
-            pass # Silent cancel
+            await self._lookup_internal(term, req_id)
+        finally:
+            if req_id == self._req_id:
+                self._pending_term = None
 
-    async def _lookup_internal(self, term: str):
-        loop = asyncio.get_running_loop()
+    def _build_adapter(self, path: str) -> DictionaryAdapter:
         try:
-            result = await loop.run_in_executor(
-                self._executor, 
-                self._adapter.lookup, 
-                term
-            )
-            
-            if result:
-                self.lookup_success.emit(result)
+            adapter = StarDictAdapter(path)
+            self._logger.info(f"Loaded StarDict: {path}")
+            return adapter
+        except Exception as e:
+            self._logger.warning(f"StarDict load failed ({e}). Using FakeDictionary fallback.")
+            return FakeDictionary()
+
+    async def _lookup_internal(self, term: str, req_id: int):
+        # Served from the adapter's cache: no round trip to the lookup thread.
+        adapter = self._adapter
+        if adapter is not None:
+            try:
+                result = adapter.get_cached(term)
+            except KeyError:
+                pass
             else:
-                self.lookup_failed.emit(f"No definition found for '{term}'")
-                
+                self._emit_result(term, result)
+                return
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._inflight = fut
+        self._requests.put((term, loop, fut))
+        try:
+            result = await fut
+        except asyncio.CancelledError:
+            if fut.cancelled():
+                return  # Superseded before the worker got to it
+            raise
         except Exception as e:
             self._logger.error(f"Lookup error: {e}")
-            self.lookup_failed.emit("Error accessing dictionary.")
+            if req_id == self._req_id:
+                self.lookup_failed.emit("Error accessing dictionary.")
+            return
+        finally:
+            if self._inflight is fut:
+                self._inflight = None
+
+        if req_id == self._req_id:
+            self._emit_result(term, result)
+
+    def _serve(self, path: str):
+        adapter = self._build_adapter(path)
+        self._adapter = adapter
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+
+            term, loop, fut = request
+            if fut.cancelled():
+                continue
+            try:
+                result = adapter.lookup(term)
+            except Exception as e:
+                loop.call_soon_threadsafe(_resolve, fut, None, e)
+            else:
+                loop.call_soon_threadsafe(_resolve, fut, result, None)
+        self._adapter = None
+        adapter.close()
+
+    def _emit_result(self, term: str, result: dict | None):
+        if result:
+            self.lookup_success.emit(result)
+        else:
+            self.lookup_failed.emit(f"No definition found for '{term}'")
 
     def close(self):
-        self._executor.shutdown(wait=False)
-        self._adapter.close()
\ No newline at end of file
+        # The worker closes the adapter once it reaches this.
+        self._requests.put(None)
\ No newline at end of file
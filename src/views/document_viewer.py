@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QScrollArea, QVBoxLayout
-from PyQt6.QtGui import QImage, QPainter, QPaintEvent
-from PyQt6.QtCore import Qt, pyqtSignal, QRect, QEvent
-from collections import OrderedDict
+from PyQt6.QtGui import QImage, QPainter, QPaintEvent, QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QEvent, QTimer
+from bisect import bisect_left, bisect_right
 from .widgets.text_overlay import TextOverlay
 
 
@@ -10,13 +10,18 @@ class PageWidget(QWidget):
     def __init__(self, index: int):
         super().__init__()
         self.index = index
-        self._image: QImage | None = None
+        # Converted once on arrival so paints blit instead of converting.
+        self._pixmap: QPixmap | None = None
         self._is_loaded = False
         self._is_rendering = False
         self._original_size = (0, 0)
 
         self._render_zoom = 100
         self._display_zoom = 100
+        # Where the pixmap is drawn; None while it maps 1:1 onto the widget.
+        # Kept current by set_image, set_display_zoom and downscale_to.
+        self._target_rect: QRectF | None = None
+        self._source_rect = QRectF()
 
         self.overlay = TextOverlay(self.index, self)
 
@@ -35,13 +40,37 @@ class PageWidget(QWidget):
 
     def set_image(self, image: QImage, render_zoom: int):
         """Sets rendered page image."""
-        self._image = image
+        # Grayscale pages stay at one byte per pixel; the raster engine
+        # paints them without widening to RGB32.
+        flags = (
+            Qt.ImageConversionFlag.NoFormatConversion
+            if image.format() == QImage.Format.Format_Grayscale8
+            else Qt.ImageConversionFlag.AutoColor
+        )
+        self._pixmap = QPixmap.fromImage(image, flags)
         self._render_zoom = render_zoom
         self._is_loaded = True
         self._is_rendering = False
+        self._update_target_rect()
         self.setStyleSheet("background-color: white; border: none;")
         self.update()
 
+    def _update_target_rect(self):
+        if not self._pixmap or self._render_zoom <= 0:
+            self._target_rect = None
+            return
+        scale_factor = self._display_zoom / self._render_zoom
+        if abs(scale_factor - 1.0) < 0.01:
+            self._target_rect = None
+        else:
+            self._target_rect = QRectF(
+                0,
+                0,
+                self._pixmap.width() * scale_factor,
+                self._pixmap.height() * scale_factor,
+            )
+            self._source_rect = QRectF(self._pixmap.rect())
+
     def set_display_zoom(self, zoom: int):
         """Updates widget size for display zoom."""
         if zoom != self._display_zoom:
@@ -49,6 +78,7 @@ class PageWidget(QWidget):
             base_w, base_h = self._original_size
             scale = zoom / 100.0
             self.setFixedSize(int(base_w * scale), int(base_h * scale))
+            self._update_target_rect()
             self.update()
 
     def is_loaded(self) -> bool:
@@ -61,12 +91,29 @@ class PageWidget(QWidget):
         """Checks if render zoom differs significantly from display zoom."""
         return self._is_loaded and abs(self._display_zoom - self._render_zoom) > 5
 
+    def downscale_to(self, zoom: int):
+        """Shrinks the current render to `zoom` in place of a re-render."""
+        if not self._pixmap:
+            return
+        base_w, base_h = self._original_size
+        scale = zoom / 100.0
+        self._pixmap = self._pixmap.scaled(
+            int(base_w * scale),
+            int(base_h * scale),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        self._render_zoom = zoom
+        self._update_target_rect()
+        self.update()
+
     def mark_rendering(self):
         self._is_rendering = True
 
     def unload_image(self):
         """Releases page image memory."""
-        self._image = None
+        self._pixmap = None
+        self._target_rect = None
         self._is_loaded = False
         self._is_rendering = False
         self._render_zoom = 100
@@ -75,18 +122,14 @@ class PageWidget(QWidget):
 
     def paintEvent(self, event: QPaintEvent):
         painter = QPainter(self)
-        if self._image:
-            scale_factor = (
-                self._display_zoom / self._render_zoom
-                if self._render_zoom > 0
-                else 1.0
-            )
-
-            if abs(scale_factor - 1.0) < 0.01:
-                painter.drawImage(0, 0, self._image)
+        pixmap = self._pixmap
+        if pixmap:
+            target = self._target_rect
+            if target is None:
+                painter.drawPixmap(0, 0, pixmap)
             else:
-                painter.scale(scale_factor, scale_factor)
-                painter.drawImage(0, 0, self._image)
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+                painter.drawPixmap(target, pixmap, self._source_rect)
         else:
             painter.drawText(
                 self.rect(),
@@ -98,7 +141,8 @@ class PageWidget(QWidget):
 
 class DocumentViewer(QWidget):
     """Scrollable container managing page widgets and rendering."""
-    request_page_render = pyqtSignal(int, int)
+    # One batch of (page_index, zoom_level) per visibility pass.
+    request_page_render = pyqtSignal(list)
     cancel_renders = pyqtSignal(set)
 
     selection_started = pyqtSignal(int, int)
@@ -108,6 +152,9 @@ class DocumentViewer(QWidget):
 
     LOOKAHEAD_PAGES = 3
     MAX_CACHED_PAGES = 12
+    DOWNSCALE_RATIO = 0.9
+    PAGE_MARGIN = 20
+    PAGE_SPACING = 10
 
     def __init__(self):
         super().__init__()
@@ -115,31 +162,51 @@ class DocumentViewer(QWidget):
         self._layout.setContentsMargins(0, 0, 0, 0)
 
         self._scroll_area = QScrollArea()
-        self._scroll_area.setWidgetResizable(True)
         self._scroll_area.setAlignment(Qt.AlignmentFlag.AlignHCenter)
 
+        # Pages are placed by hand from _base_page_sizes: sizes are known
+        # up front, so a layout would only add passes on every zoom step.
         self._container = QWidget()
-        self._container_layout = QVBoxLayout(self._container)
-        self._container_layout.setContentsMargins(20, 20, 20, 20)
-        self._container_layout.setSpacing(10)
-        self._container_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter)
 
         self._scroll_area.setWidget(self._container)
         self._layout.addWidget(self._scroll_area)
 
         self._scroll_area.viewport().installEventFilter(self)
 
+        # Page widgets exist only around the viewport.
         self._pages: dict[int, PageWidget] = {}
         self._total_pages = 0
-        self._loaded_pages: OrderedDict[int, bool] = OrderedDict()
+        self._overlay_data: dict[int, list] = {}
+        self._highlight_page: int | None = None
+        self._highlight_rects: list = []
+        # Pages whose overlay still uses an older zoom than the page itself.
+        self._overlay_dirty: set[int] = set()
+        self._loaded_pages: set[int] = set()
         self._current_render_range: set[int] = set()
+        # Middle of the visible pages; loaded pages are evicted farthest first.
+        self._viewport_center = 0.0
 
         self._base_page_sizes: list[tuple[int, int]] = []
+
+        # Page geometry in container coordinates at the display zoom;
+        # rebuilt by _relayout.
+        self._page_tops: list[int] = []
+        self._page_heights: list[int] = []
         self._display_zoom = 100
         self._committed_zoom = 100
 
         self._scroll_bar = self._scroll_area.verticalScrollBar()
-        self._scroll_bar.valueChanged.connect(self._check_visibility)
+        # Scrolling fires valueChanged per pixel; the changes since the last
+        # idle tick share one visibility pass.
+        self._visibility_timer = QTimer(self)
+        self._visibility_timer.setSingleShot(True)
+        self._visibility_timer.setInterval(0)
+        self._visibility_timer.timeout.connect(self._check_visibility)
+        self._scroll_bar.valueChanged.connect(self._schedule_visibility_check)
+
+    def _schedule_visibility_check(self, _value: int):
+        if not self._visibility_timer.isActive():
+            self._visibility_timer.start()
 
     def eventFilter(self, source, event):
         if (
@@ -151,55 +218,76 @@ class DocumentViewer(QWidget):
         return super().eventFilter(source, event)
 
     def load_document_layout(self, page_sizes: list[tuple[int, int]]):
-        """Creates page widgets from document layout."""
+        """Sizes the document from page sizes; widgets come later."""
+        for page in self._pages.values():
+            page.deleteLater()
         self._pages.clear()
         self._loaded_pages.clear()
+        self._overlay_data.clear()
+        self._overlay_dirty.clear()
+        self._highlight_page = None
+        self._highlight_rects = []
         self._base_page_sizes = page_sizes
         self._total_pages = len(page_sizes)
+        self._relayout()
 
-        while self._container_layout.count():
-            item = self._container_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        for idx, (w, h) in enumerate(page_sizes):
-            page = PageWidget(idx)
-            page.set_placeholder_size(w, h)
+        QTimer.singleShot(100, self._check_visibility)
 
-            page.overlay.selection_started.connect(
-                lambda char_idx, p_idx=idx: self.selection_started.emit(
-                    p_idx, char_idx
-                )
+    def _materialize_page(self, idx: int) -> PageWidget:
+        """Creates the PageWidget for a page and places it."""
+        page = PageWidget(idx)
+        w, h = self._base_page_sizes[idx]
+        page.set_placeholder_size(w, h)
+        page.set_display_zoom(self._display_zoom)
+        page.overlay.update_data(self._overlay_data.get(idx, []), self._display_zoom)
+        self._overlay_dirty.discard(idx)
+        if idx == self._highlight_page:
+            page.overlay.set_highlight_rects(self._highlight_rects)
+
+        page.overlay.selection_started.connect(
+            lambda char_idx, p_idx=idx: self.selection_started.emit(
+                p_idx, char_idx
             )
+        )
 
-            page.overlay.selection_updated.connect(
-                self.selection_updated.emit
-            )
+        page.overlay.selection_updated.connect(
+            self.selection_updated.emit
+        )
 
-            page.overlay.word_selection_requested.connect(
-                lambda char_idx, p_idx=idx: self.word_selection_requested.emit(
-                    p_idx, char_idx
-                )
+        page.overlay.word_selection_requested.connect(
+            lambda char_idx, p_idx=idx: self.word_selection_requested.emit(
+                p_idx, char_idx
             )
+        )
 
-            page.overlay.selection_cleared.connect(
-                self.selection_cleared.emit
-            )
+        page.overlay.selection_cleared.connect(
+            self.selection_cleared.emit
+        )
 
-            self._container_layout.addWidget(page)
-            self._pages[idx] = page
+        page.setParent(self._container)
+        page.move(self._page_x(page.width()), self._page_tops[idx])
+        page.show()
+        self._pages[idx] = page
+        return page
 
-        from PyQt6.QtCore import QTimer
-        QTimer.singleShot(100, self._check_visibility)
+    def _release_page(self, idx: int):
+        """Deletes a page's widget; its slot stays reserved by the offsets."""
+        page = self._pages.pop(idx)
+        page.hide()
+        page.deleteLater()
 
     def update_overlay_data(self, page_index: int, bboxes: list, zoom: int):
+        self._overlay_data[page_index] = bboxes
         if page_index in self._pages:
             self._pages[page_index].overlay.update_data(bboxes, zoom)
+            self._overlay_dirty.discard(page_index)
 
     def set_selection_highlights(self, page_index: int, rects: list):
-        for p in self._pages.values():
-            p.overlay.set_highlight_rects([])
+        if self._highlight_page != page_index and self._highlight_page in self._pages:
+            self._pages[self._highlight_page].overlay.set_highlight_rects([])
 
+        self._highlight_page = page_index
+        self._highlight_rects = rects
         if page_index in self._pages:
             self._pages[page_index].overlay.set_highlight_rects(rects)
 
@@ -207,60 +295,141 @@ class DocumentViewer(QWidget):
         self._display_zoom = zoom_level
         for page in self._pages.values():
             page.set_display_zoom(zoom_level)
-            page.overlay.update_data(page.overlay._bboxes, zoom_level)
+        self._overlay_dirty.update(self._pages)
+        self._relayout()
+
+        # Only on-screen overlays follow the preview; the rest catch up when
+        # they scroll into view.
+        self._refresh_overlays(self._visible_indices())
+
+    def _refresh_overlays(self, indices: list[int]):
+        for index in indices:
+            if index in self._overlay_dirty and index in self._pages:
+                self._overlay_dirty.discard(index)
+                overlay = self._pages[index].overlay
+                overlay.update_data(overlay._bboxes, self._display_zoom)
 
     def handle_zoom_committed(self, zoom_level: int):
+        if zoom_level != self._display_zoom:
+            self.handle_zoom_preview(zoom_level)
         self._committed_zoom = zoom_level
 
         for page in self._pages.values():
             if page.is_loaded() and page.needs_rerender():
-                page.unload_image()
-
-        self._loaded_pages.clear()
+                # Zooming out: the existing render has more pixels than needed.
+                if zoom_level < page._render_zoom * self.DOWNSCALE_RATIO:
+                    page.downscale_to(zoom_level)
+                else:
+                    page.unload_image()
+
+        # Keep tracking the pages that stay loaded so they can still be evicted.
+        self._loaded_pages = {i for i in self._loaded_pages if self._pages[i].is_loaded()}
         self._current_render_range.clear()
 
-        from PyQt6.QtCore import QTimer
         QTimer.singleShot(50, self._check_visibility)
 
     def update_page_image(self, page_index: int, image: QImage, render_zoom: int):
         if page_index in self._pages:
             self._pages[page_index].set_image(image, render_zoom)
-
-            if page_index in self._loaded_pages:
-                self._loaded_pages.move_to_end(page_index)
-            else:
-                self._loaded_pages[page_index] = True
-
-            self._current_render_range.discard(page_index)
+            self._loaded_pages.add(page_index)
             self._evict_old_pages()
 
     def _evict_old_pages(self):
-        while len(self._loaded_pages) > self.MAX_CACHED_PAGES:
-            oldest_index, _ = self._loaded_pages.popitem(last=False)
-            if oldest_index in self._pages:
-                self._pages[oldest_index].unload_image()
+        excess = len(self._loaded_pages) - self.MAX_CACHED_PAGES
+        if excess <= 0:
+            return
 
-    def _check_visibility(self):
-        scroll_y = self._scroll_bar.value()
-        viewport_height = self._scroll_area.viewport().height()
-        viewport_rect = QRect(
-            0,
-            scroll_y,
-            self._container.width(),
-            viewport_height,
+        # Scrolling back and forth revisits nearby pages, so distance from
+        # the viewport predicts reuse better than render order.
+        center = self._viewport_center
+        farthest = sorted(self._loaded_pages, key=lambda idx: -abs(idx - center))
+        for index in farthest[:excess]:
+            self._loaded_pages.discard(index)
+            if index == self._highlight_page:
+                self._pages[index].unload_image()
+            elif index in self._pages:
+                self._release_page(index)
+
+    def _release_cancelled_pages(self, keep_indices: set[int]):
+        """
+        Releases pages outside `keep_indices` that only hold a placeholder or
+        a scaled preview awaiting a render that was just cancelled. Pages
+        with a current render stay for _evict_old_pages.
+        """
+        for index in [
+            idx for idx, page in self._pages.items()
+            if idx not in keep_indices
+            and (not page.is_loaded() or page.is_rendering())
+        ]:
+            page = self._pages[index]
+            self._loaded_pages.discard(index)
+            if index != self._highlight_page:
+                self._release_page(index)
+            elif page.is_loaded() or page.is_rendering():
+                page.unload_image()
+
+    def _relayout(self):
+        """Recomputes page offsets in one pass and moves the live widgets."""
+        scale = self._display_zoom / 100.0
+        top = self.PAGE_MARGIN
+        width = 0
+        self._page_tops = []
+        self._page_heights = []
+        for base_w, base_h in self._base_page_sizes:
+            height = int(base_h * scale)
+            self._page_tops.append(top)
+            self._page_heights.append(height)
+            top += height + self.PAGE_SPACING
+            width = max(width, int(base_w * scale))
+
+        bottom = top - self.PAGE_SPACING if self._total_pages else top
+        self._container.setUpdatesEnabled(False)
+        try:
+            self._container.setFixedSize(
+                width + 2 * self.PAGE_MARGIN, bottom + self.PAGE_MARGIN
+            )
+            for idx, page in self._pages.items():
+                page.move(self._page_x(page.width()), self._page_tops[idx])
+        finally:
+            self._container.setUpdatesEnabled(True)
+        self._container.update()
+
+    def _page_x(self, page_width: int) -> int:
+        return (self._container.width() - page_width) // 2
+
+    def _is_settled(self, index: int) -> bool:
+        page = self._pages.get(index)
+        return (
+            page is not None
+            and (page.is_loaded() or page.is_rendering())
+            and not page.needs_rerender()
         )
 
-        visible_indices = [
+    def _visible_indices(self) -> list[int]:
+        scroll_y = self._scroll_bar.value()
+        viewport_bottom = scroll_y + self._scroll_area.viewport().height()
+
+        tops = self._page_tops
+
+        # Pages starting before the viewport's bottom, minus those that
+        # end above its top.
+        lo = max(0, bisect_right(tops, scroll_y) - 1)
+        hi = bisect_left(tops, viewport_bottom)
+        return [
             index
-            for index, page in self._pages.items()
-            if page.geometry().intersects(viewport_rect)
+            for index in range(lo, hi)
+            if tops[index] + self._page_heights[index] > scroll_y
         ]
 
+    def _check_visibility(self):
+        visible_indices = self._visible_indices()
         if not visible_indices:
             return
+        self._refresh_overlays(visible_indices)
 
         min_visible = min(visible_indices)
         max_visible = max(visible_indices)
+        self._viewport_center = (min_visible + max_visible) / 2
 
         render_start = max(0, min_visible - self.LOOKAHEAD_PAGES)
         render_end = min(
@@ -269,12 +438,22 @@ class DocumentViewer(QWidget):
         )
 
         new_render_range = set(range(render_start, render_end + 1))
+
+        # Same range with every page loaded or on its way: nothing to do.
+        if new_render_range == self._current_render_range and all(
+            self._is_settled(index) for index in new_render_range
+        ):
+            return
+
         self.cancel_renders.emit(new_render_range)
+        self._release_cancelled_pages(new_render_range)
 
         pages_to_request = []
 
         for index in new_render_range:
-            page = self._pages[index]
+            page = self._pages.get(index)
+            if page is None:
+                page = self._materialize_page(index)
             if (
                 not page.is_loaded()
                 and not page.is_rendering()
@@ -284,19 +463,17 @@ class DocumentViewer(QWidget):
 
         self._current_render_range = new_render_range
 
-        viewport_center = (min_visible + max_visible) / 2
         pages_to_request.sort(
-            key=lambda idx: abs(idx - viewport_center)
+            key=lambda idx: abs(idx - self._viewport_center)
         )
 
-        for index in pages_to_request:
+        if pages_to_request:
             self.request_page_render.emit(
-                index,
-                self._committed_zoom,
+                [(index, self._committed_zoom) for index in pages_to_request]
             )
 
     def calculate_fit_zoom(self, mode: str) -> int:
-        if not self._base_page_sizes or not self._pages:
+        if not self._base_page_sizes:
             return 100
 
         viewport_width = self._scroll_area.viewport().width()
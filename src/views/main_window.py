@@ -1,16 +1,22 @@
 import asyncio
-from PyQt6.QtWidgets import QMainWindow, QToolBar, QApplication
+from PyQt6.QtWidgets import QMainWindow, QToolBar
 from PyQt6.QtGui import QKeySequence, QShortcut, QCursor
-from PyQt6.QtCore import Qt, QEvent, QRectF
+from PyQt6.QtCore import Qt, QEvent, QPointF, QTimer
 
 from .document_viewer import DocumentViewer
 from .widgets.zoom_controls import ZoomControls
-from .widgets.translation_popup import TranslationPopup
+from .widgets.translation_popup import TranslationPopup, POPUP_WIDTH, SHADOW_MARGINS
 from ..viewmodels.document_viewmodel import DocumentViewModel
 from ..viewmodels.zoom_viewmodel import ZoomViewModel
 from ..viewmodels.selection_viewmodel import SelectionViewModel
 from ..viewmodels.translation_viewmodel import TranslationViewModel
 from ..utils.logging import get_logger
+from ..utils.zoom_math import compute_zoom_step
+
+POPUP_FALLBACK_HEIGHT = 200
+POPUP_GAP = 8
+SCREEN_MARGIN = 20
+SCREEN_MIN_LEFT = 10
 
 
 class MainWindow(QMainWindow):
@@ -41,8 +47,9 @@ class MainWindow(QMainWindow):
 
         # --- Connections: Document ---
         self.vm.document_loaded.connect(self._handle_document_loaded)
+        self.vm.selection_model_ready.connect(self._handle_selection_model_ready)
         self.vm.page_rendered.connect(self.viewer.update_page_image)
-        self.viewer.request_page_render.connect(self._handle_page_request)
+        self.viewer.request_page_render.connect(self.vm.request_pages)
         self.viewer.cancel_renders.connect(self.vm.cancel_obsolete_renders)
 
         # --- Connections: Zoom ---
@@ -64,7 +71,29 @@ class MainWindow(QMainWindow):
         self.translation_vm.lookup_failed.connect(self._handle_lookup_error)
 
         # --- Event Filters ---
-        self.viewer.installEventFilter(self)
+        # The viewport receives the wheel events; the scroll area would
+        # otherwise consume Ctrl+Wheel before it reaches the viewer.
+        self._zoom_wheel_target = self.viewer._scroll_area.viewport()
+        self._zoom_wheel_target.installEventFilter(self)
+
+        # Ctrl+Wheel bursts are applied as one zoom step after a quiet frame.
+        self._pending_zoom_delta = 0
+        self._scroll_zoom_anchor: tuple[int, int] | None = None
+        self._zoom_coalesce_timer = QTimer(self)
+        self._zoom_coalesce_timer.setSingleShot(True)
+        self._zoom_coalesce_timer.setInterval(16)
+        self._zoom_coalesce_timer.timeout.connect(self._flush_scroll_zoom)
+
+        # Popup placement and lookup trail a drag by one short quiet window.
+        self._pending_selection: tuple[str, int] | None = None
+        self._last_sel_key: tuple[int, str] | None = None
+        self._sel_debounce = QTimer(self)
+        self._sel_debounce.setSingleShot(True)
+        self._sel_debounce.setInterval(30)
+        self._sel_debounce.timeout.connect(self._flush_selection)
+
+        # Available screen area for popup placement; refreshed after moves.
+        self._screen_geo = None
 
     def _setup_zoom_ui(self):
         toolbar = QToolBar("Zoom")
@@ -96,16 +125,19 @@ class MainWindow(QMainWindow):
 
     def _handle_document_loaded(self, page_sizes):
         self.viewer.load_document_layout(page_sizes)
-
-        for i in range(len(page_sizes)):
-            model = self.vm.get_selection_model(i)
-            if model:
-                self.selection_vm.register_page_model(i, model)
-                self.viewer.update_overlay_data(
-                    i,
-                    model._characters,
-                    self.zoom_vm.get_zoom(),
-                )
+        self.selection_vm.reset_pages(len(page_sizes))
+        # Selection models are built after this signal and each one arrives
+        # through selection_model_ready, so there is nothing to scan here.
+
+    def _handle_selection_model_ready(self, page_index: int):
+        model = self.vm.get_selection_model(page_index)
+        if model:
+            self.selection_vm.register_page_model(page_index, model)
+            self.viewer.update_overlay_data(
+                page_index,
+                model._characters,
+                self.zoom_vm.get_zoom(),
+            )
 
     def _handle_selection_cleared(self):
         """Clears selection logic and hides UI."""
@@ -123,13 +155,31 @@ class MainWindow(QMainWindow):
         self.viewer.set_selection_highlights(active_page, bboxes)
 
         if not text.strip():
+            self._sel_debounce.stop()
+            self._pending_selection = None
+            self._last_sel_key = None
             self.popup.hide()
             return
 
+        # Repeats only count while their popup is still up; once it has been
+        # hidden (zoom, Esc, click-out), the same selection shows it again.
+        key = (active_page, text)
+        if key == self._last_sel_key and self.popup.isVisible():
+            return
+        self._last_sel_key = key
+        self._pending_selection = (text, active_page)
+        self._sel_debounce.start()
+
+    def _flush_selection(self):
+        if self._pending_selection is None:
+            return
+        text, active_page = self._pending_selection
+        self._pending_selection = None
+
         self._logger.info(f"Selection Captured: '{text}'")
 
         # 1. Position and Show Loading (UX Priority)
-        self._position_and_show_popup(active_page, bboxes, text)
+        self._position_and_show_popup(active_page, text)
         
         # 2. Trigger Async Lookup
         asyncio.create_task(self.translation_vm.lookup(text))
@@ -145,58 +195,63 @@ class MainWindow(QMainWindow):
         }
         self.popup.show_result(error_data)
 
-    def _position_and_show_popup(self, page_index: int, bboxes: list[QRectF], text: str):
+    def _position_and_show_popup(self, page_index: int, text: str):
         """Smart positioning logic: Map -> Clamp -> Flip."""
         if page_index not in self.viewer._pages:
             return
 
         page_widget = self.viewer._pages[page_index]
-        if not bboxes:
+
+        # 1. Selection Bounds in Points (one reduction over the range)
+        union_rect = self.selection_vm.get_selection_bounds(page_index)
+        if union_rect is None:
             return
-        
-        # 1. Calculate Union Rect (Selection Bounds in Points)
-        union_rect = bboxes[0]
-        for r in bboxes[1:]:
-            union_rect = union_rect.united(r)
 
         # 2. Scale to Current Zoom
         scale = self.zoom_vm.get_zoom() / 100.0
-        widget_rect = QRectF(
-            union_rect.x() * scale,
-            union_rect.y() * scale,
-            union_rect.width() * scale,
-            union_rect.height() * scale
-        )
-
-        # 3. Map to Global Screen Coordinates
-        top_left_global = page_widget.mapToGlobal(widget_rect.topLeft().toPoint())
-        bottom_left_global = page_widget.mapToGlobal(widget_rect.bottomLeft().toPoint())
+        left = union_rect.left() * scale
+        top = union_rect.top() * scale
+        bottom = union_rect.bottom() * scale
+
+        # 3. Map to Global Screen Coordinates (one mapping; the bottom edge
+        # is the same offset globally as locally)
+        top_left = QPointF(left, top).toPoint()
+        top_left_global = page_widget.mapToGlobal(top_left)
+        global_x = top_left_global.x()
+        global_top = top_left_global.y()
+        global_bottom = global_top + QPointF(left, bottom).toPoint().y() - top_left.y()
         
         # 4. Get Screen Geometry constraints
-        screen_geo = self.screen().availableGeometry()
+        if self._screen_geo is None:
+            self._screen_geo = self.screen().availableGeometry()
+        screen_geo = self._screen_geo
         
-        # Force size calculation if hidden (estimate or actual)
-        popup_width = 440 # Matches CSS width in popup
-        popup_height = self.popup.sizeHint().height() or 200
+        # Last real height of the popup (estimate until it has been shown)
+        popup_height = self.popup.cached_height or POPUP_FALLBACK_HEIGHT
 
         # 5. Vertical Logic (Flip Strategy)
         # Default: Place below the text
-        target_y = bottom_left_global.y() + 8 
+        target_y = global_bottom + POPUP_GAP
         
         # Check if it hits the bottom of the screen
-        if target_y + popup_height > screen_geo.bottom() - 20:
-            # FLIP: Place above the text
-            target_y = top_left_global.y() - popup_height - 8
+        if target_y + popup_height > screen_geo.bottom() - SCREEN_MARGIN:
+            # FLIP: Place above the text. The shadow margin under the
+            # container is deeper than the one above it; keep the visible
+            # gap the same either way.
+            target_y = (
+                global_top - popup_height - POPUP_GAP
+                + SHADOW_MARGINS.bottom() - SHADOW_MARGINS.top()
+            )
 
         # 6. Horizontal Logic (Clamp Strategy)
-        target_x = bottom_left_global.x()
+        target_x = global_x
         
         # Check right edge
-        if target_x + popup_width > screen_geo.right() - 20:
-            target_x = screen_geo.right() - popup_width - 20
+        if target_x + POPUP_WIDTH > screen_geo.right() - SCREEN_MARGIN:
+            target_x = screen_geo.right() - POPUP_WIDTH - SCREEN_MARGIN
             
         # Check left edge
-        target_x = max(screen_geo.left() + 10, target_x)
+        target_x = max(screen_geo.left() + SCREEN_MIN_LEFT, target_x)
 
         # 7. Apply
         self.popup.move(int(target_x), int(target_y))
@@ -219,17 +274,10 @@ class MainWindow(QMainWindow):
 
     def _handle_zoom_committed(self, zoom_level: int):
         self.vm.set_zoom(zoom_level)
+        # The viewer already holds every page's characters and rescales
+        # overlays as pages come into view.
         self.viewer.handle_zoom_committed(zoom_level)
 
-        for i in range(self.vm._parser.get_page_count()):
-            model = self.vm.get_selection_model(i)
-            if model:
-                self.viewer.update_overlay_data(
-                    i,
-                    model._characters,
-                    zoom_level,
-                )
-
     def _update_zoom_display(self):
         zoom_level = self.zoom_vm.get_zoom()
         mode = self.zoom_vm.get_mode()
@@ -250,10 +298,15 @@ class MainWindow(QMainWindow):
             label,
         )
 
-    def _handle_page_request(self, page_index: int, zoom_level: int):
-        asyncio.create_task(
-            self.vm.request_page(page_index, zoom_level)
-        )
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        # May now be on another screen; looked up again on next placement.
+        self._screen_geo = None
+
+    def closeEvent(self, event):
+        self.vm.close()
+        self.translation_vm.close()
+        super().closeEvent(event)
 
     # --- File Loading ---
 
@@ -263,36 +316,47 @@ class MainWindow(QMainWindow):
     # --- Event Filter (Ctrl+Scroll) ---
 
     def eventFilter(self, obj, event):
-        if obj == self.viewer and event.type() == QEvent.Type.Wheel:
-            if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
-                self._handle_scroll_zoom(event)
-                return True
-        return super().eventFilter(obj, event)
+        if event.type() != QEvent.Type.Wheel:
+            return False
+        if obj is not self._zoom_wheel_target or not (
+            event.modifiers() & Qt.KeyboardModifier.ControlModifier
+        ):
+            return False
+        self._handle_scroll_zoom(event)
+        return True
 
     def _handle_scroll_zoom(self, wheel_event):
-        scroll_area = self.viewer._scroll_area
-        scroll_bar = scroll_area.verticalScrollBar()
-        old_scroll = scroll_bar.value()
-
-        cursor_pos = scroll_area.viewport().mapFromGlobal(QCursor.pos())
-        doc_y_before = old_scroll + cursor_pos.y()
+        if self._pending_zoom_delta == 0:
+            # Anchor the burst at the cursor position when it started.
+            scroll_area = self.viewer._scroll_area
+            cursor_pos = scroll_area.viewport().mapFromGlobal(QCursor.pos())
+            old_scroll = scroll_area.verticalScrollBar().value()
+            self._scroll_zoom_anchor = (old_scroll + cursor_pos.y(), cursor_pos.y())
+
+        self._pending_zoom_delta += wheel_event.angleDelta().y()
+        self._zoom_coalesce_timer.start()
+
+    def _flush_scroll_zoom(self):
+        delta = self._pending_zoom_delta
+        self._pending_zoom_delta = 0
+        if not delta or self._scroll_zoom_anchor is None:
+            return
+        doc_y_before, cursor_y = self._scroll_zoom_anchor
 
         old_zoom = self.zoom_vm.get_zoom()
-        delta = wheel_event.angleDelta().y()
-        new_zoom = int(old_zoom + (delta / 120.0) * 10)
-        new_zoom = max(
+        new_zoom, new_scroll = compute_zoom_step(
+            old_zoom,
+            delta,
+            doc_y_before,
+            cursor_y,
             ZoomViewModel.MIN_ZOOM,
-            min(ZoomViewModel.MAX_ZOOM, new_zoom),
+            ZoomViewModel.MAX_ZOOM,
         )
 
         self.zoom_vm.set_zoom(new_zoom)
 
         if old_zoom > 0:
-            zoom_ratio = new_zoom / old_zoom
-            new_scroll = int(
-                doc_y_before * zoom_ratio - cursor_pos.y()
-            )
-            from PyQt6.QtCore import QTimer
+            scroll_bar = self.viewer._scroll_area.verticalScrollBar()
             QTimer.singleShot(
                 0,
                 lambda: scroll_bar.setValue(new_scroll),
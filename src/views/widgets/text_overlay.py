@@ -1,9 +1,9 @@
-import math
-from typing import List, Optional
+import numpy as np
+from typing import Iterator, List, Optional
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtGui import QPainter, QBrush, QColor, QPainterPath
+from PyQt6.QtGui import QPainter, QPainterPath, QBrush, QColor
 from PyQt6.QtCore import Qt, QRectF, QPointF, pyqtSignal
-from ...models.selection.selection_model import CharMetadata
+from ...models.selection.selection_model import CharBoxArrays, CharMetadata
 
 
 class TextOverlay(QWidget):
@@ -13,59 +13,140 @@ class TextOverlay(QWidget):
     selection_cleared = pyqtSignal()
 
     MAGNETIC_THRESHOLD = 15.0
+    # Below this many glyphs a plain loop beats building NumPy temporaries.
+    SCALAR_HIT_TEST_MAX = 64
 
     def __init__(self, page_index: int, parent=None):
         super().__init__(parent)
         self._page_index = page_index
 
+        # Kept for the scalar path on small pages; hit tests on larger ones
+        # read the box arrays, centres and y0-sorted indices, built on the
+        # first hit test after the bboxes change.
         self._bboxes: List[CharMetadata] = []
+        self._boxes: Optional[CharBoxArrays] = None
+        self._cx: Optional[np.ndarray] = None
+        self._cy: Optional[np.ndarray] = None
+        self._y_order: Optional[np.ndarray] = None
+        self._y_sorted: Optional[np.ndarray] = None
+        self._max_height = 0.0
         self._highlight_rects: List[QRectF] = []
+        # Highlight edges (left, top, right, bottom) in points, one row per rect.
+        self._highlight_edges = np.empty((0, 4))
+        # Highlight outline at _display_zoom, reused across paints until the
+        # rects or the zoom change.
+        self._highlight_path: Optional[QPainterPath] = None
 
         self._display_zoom = 100
 
         self._drag_start_pos: Optional[QPointF] = None
         self._pending_start_idx: Optional[int] = None
         self._is_dragging = False
+        self._last_drag_idx: Optional[int] = None
 
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, False)
         self.setMouseTracking(True)
 
     def update_data(self, bboxes: List[CharMetadata], zoom: int):
-        self._bboxes = bboxes
-        self._display_zoom = zoom
+        if bboxes is not self._bboxes:
+            self._bboxes = bboxes
+            self._boxes = None
+        if zoom != self._display_zoom:
+            self._display_zoom = zoom
+            self._highlight_path = None
         self.update()
 
     def set_highlight_rects(self, rects: List[QRectF]):
+        # Unchanged highlights keep the cached path.
+        if rects == self._highlight_rects:
+            return
         self._highlight_rects = rects
+        self._highlight_edges = np.array(
+            [(r.left(), r.top(), r.right(), r.bottom()) for r in rects],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        self._highlight_path = None
         self.update()
 
     def _ui_to_pdf_point(self, pos: QPointF) -> QPointF:
         scale = 100.0 / self._display_zoom
         return QPointF(pos.x() * scale, pos.y() * scale)
 
-    def _get_char_index_at(self, pos: QPointF) -> Optional[int]:
-        pdf_pos = self._ui_to_pdf_point(pos)
-        closest_idx = None
-        min_dist = float("inf")
-        pdf_threshold = self.MAGNETIC_THRESHOLD / (self._display_zoom / 100.0)
+    def _build_bbox_index(self):
+        boxes = CharBoxArrays.from_characters(self._bboxes)
+        self._boxes = boxes
+        self._cx = (boxes.x0 + boxes.x1) / 2
+        self._cy = (boxes.y0 + boxes.y1) / 2
+        self._y_order = np.argsort(boxes.y0, kind="stable")
+        self._y_sorted = boxes.y0[self._y_order]
+        self._max_height = float((boxes.y1 - boxes.y0).max())
 
+    def _hit_test_scalar(self, px: float, py: float, threshold: float) -> Optional[int]:
+        closest_idx = None
+        min_dist_sq = threshold * threshold
+        top, bottom = py - threshold, py + threshold
         for i, item in enumerate(self._bboxes):
-            rect = item.bbox
-            if rect.contains(pdf_pos):
+            x0, y0, x1, y1 = item.rect
+            # Boxes wholly outside the band can neither contain the point
+            # nor have a centre within the threshold.
+            if y1 < top or y0 > bottom:
+                continue
+            if x0 <= px <= x1 and y0 <= py <= y1:
                 return i
 
-            center = rect.center()
-            dist = math.hypot(
-                pdf_pos.x() - center.x(),
-                pdf_pos.y() - center.y(),
-            )
-
-            if dist < min_dist and dist < pdf_threshold:
-                min_dist = dist
+            dx = px - (x0 + x1) / 2
+            dy = py - (y0 + y1) / 2
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < min_dist_sq:
+                min_dist_sq = dist_sq
                 closest_idx = i
 
         return closest_idx
 
+    def _get_char_index_at(self, pos: QPointF) -> Optional[int]:
+        if not self._bboxes:
+            return None
+
+        pdf_pos = self._ui_to_pdf_point(pos)
+        pdf_threshold = self.MAGNETIC_THRESHOLD / (self._display_zoom / 100.0)
+
+        px, py = pdf_pos.x(), pdf_pos.y()
+        if len(self._bboxes) < self.SCALAR_HIT_TEST_MAX:
+            return self._hit_test_scalar(px, py, pdf_threshold)
+
+        if self._boxes is None:
+            self._build_bbox_index()
+
+        # Only boxes starting within a band around py can contain the point
+        # or have a centre within the threshold. Candidates stay in list
+        # order so ties resolve to the earliest character.
+        lo = np.searchsorted(
+            self._y_sorted, py - pdf_threshold - self._max_height, side="left"
+        )
+        hi = np.searchsorted(self._y_sorted, py + pdf_threshold, side="right")
+        if lo == hi:
+            return None
+        candidates = np.sort(self._y_order[lo:hi])
+        boxes = self._boxes
+
+        inside = (
+            (boxes.x0[candidates] <= px) & (px <= boxes.x1[candidates])
+            & (boxes.y0[candidates] <= py) & (py <= boxes.y1[candidates])
+        )
+        hit = inside.argmax()
+        if inside[hit]:
+            return int(candidates[hit])
+
+        # Otherwise the nearest centre within the magnetic threshold,
+        # compared squared to skip the square roots.
+        dx = self._cx[candidates] - px
+        dy = self._cy[candidates] - py
+        dist_sq = dx * dx + dy * dy
+        closest = dist_sq.argmin()
+        if dist_sq[closest] < pdf_threshold * pdf_threshold:
+            return int(candidates[closest])
+        return None
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.selection_cleared.emit()
@@ -90,11 +171,13 @@ class TextOverlay(QWidget):
                 ).manhattanLength()
                 if drag_dist > QApplication.startDragDistance():
                     self._is_dragging = True
+                    self._last_drag_idx = None
                     self.selection_started.emit(self._pending_start_idx)
 
             if self._is_dragging:
                 idx = self._get_char_index_at(event.position())
-                if idx is not None:
+                if idx is not None and idx != self._last_drag_idx:
+                    self._last_drag_idx = idx
                     self.selection_updated.emit(idx)
 
     def mouseReleaseEvent(self, event):
@@ -108,67 +191,56 @@ class TextOverlay(QWidget):
             if idx is not None:
                 self.word_selection_requested.emit(idx)
 
-    def _merge_rects(self, rects: List[QRectF]) -> List[QRectF]:
-        if not rects:
-            return []
-
-        sorted_rects = sorted(
-            rects,
-            key=lambda r: (int(r.center().y() / 10), r.x()),
-        )
-
-        merged = []
-        current_rect = sorted_rects[0]
-
-        for next_rect in sorted_rects[1:]:
-            vertical_aligned = (
-                abs(current_rect.center().y() - next_rect.center().y()) < 5
-            )
-            horizontal_touching = (
-                next_rect.left() < current_rect.right() + 4
-            )
-
-            if vertical_aligned and horizontal_touching:
-                current_rect = current_rect.united(next_rect)
-            else:
-                merged.append(current_rect)
-                current_rect = next_rect
+    @staticmethod
+    def _iter_merged(edges: np.ndarray) -> Iterator[tuple]:
+        """Yields one (left, top, right, bottom) block per touching run of rows."""
+        if not len(edges):
+            return
 
-        merged.append(current_rect)
-        return merged
+        # Rows are runs of centres less than 5px apart in y, so rects
+        # straddling a fixed bucket boundary still share a row.
+        centers_y = (edges[:, 1] + edges[:, 3]) / 2
+        order = np.argsort(centers_y, kind="stable")
+        row_breaks = np.flatnonzero(np.diff(centers_y[order]) >= 5) + 1
+
+        for row in np.split(order, row_breaks):
+            row_edges = edges[row[np.argsort(edges[row, 0], kind="stable")]].tolist()
+
+            left, top, right, bottom = row_edges[0]
+            for next_left, next_top, next_right, next_bottom in row_edges[1:]:
+                if next_left < right + 4:
+                    top = min(top, next_top)
+                    right = max(right, next_right)
+                    bottom = max(bottom, next_bottom)
+                else:
+                    yield left, top, right, bottom
+                    left, top, right, bottom = next_left, next_top, next_right, next_bottom
+            yield left, top, right, bottom
 
     def paintEvent(self, event):
         if not self._highlight_rects:
             return
 
+        if self._highlight_path is None:
+            self._highlight_path = self._build_highlight_path()
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         highlight_color = QColor(0, 122, 255, 75)
         painter.setBrush(QBrush(highlight_color))
         painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawPath(self._highlight_path)
+        painter.end()
 
+    def _build_highlight_path(self) -> QPainterPath:
+        # Blocks on adjacent rows can overlap; one simplified path fills
+        # each pixel once instead of blending the overlap twice.
         scale = self._display_zoom / 100.0
-
-        ui_rects = [
-            QRectF(
-                r.x() * scale,
-                r.y() * scale,
-                r.width() * scale,
-                r.height() * scale,
-            )
-            for r in self._highlight_rects
-        ]
-
-        solid_blocks = self._merge_rects(ui_rects)
-
         path = QPainterPath()
-        for rect in solid_blocks:
-            path.addRoundedRect(
-                rect.adjusted(0, 1, 0, -1),
-                3,
-                3,
-            )
-
-        painter.drawPath(path)
-        painter.end()
+        # Winding fill, so simplified() unites the overlap instead of
+        # cutting it out.
+        path.setFillRule(Qt.FillRule.WindingFill)
+        for left, top, right, bottom in self._iter_merged(self._highlight_edges * scale):
+            path.addRoundedRect(QRectF(left, top + 1, right - left, bottom - top - 2), 3, 3)
+        return path.simplified()
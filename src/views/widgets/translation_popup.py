@@ -1,9 +1,177 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QFrame,
-    QPushButton, QGraphicsDropShadowEffect, QSizePolicy, QApplication
+    QPushButton, QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect,
+    qDrawBorderPixmap
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QColor, QCursor
+from PyQt6.QtCore import Qt, pyqtSignal, QMargins, QRectF
+from PyQt6.QtGui import QColor, QCursor, QImage, QPainter, QPixmap
+
+
+def _compute_roman(n: int) -> str:
+    val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
+    syb = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
+    roman_num = ''
+    i = 0
+    while n > 0:
+        for _ in range(n // val[i]):
+            roman_num += syb[i]
+            n -= val[i]
+        i += 1
+    return roman_num
+
+
+# Definition numbers rarely pass a few dozen.
+_ROMAN = tuple(_compute_roman(i) for i in range(51))
+
+
+# Stands in for the QGraphicsDropShadowEffect this replaced (blur radius 24,
+# offset (8, 8), alpha 40). SHADOW_SPREAD is how far that blur reached past
+# the box; SHADOW_BLUR is the QGraphicsBlurEffect radius with the same falloff.
+SHADOW_BLUR = 8
+SHADOW_SPREAD = 20
+SHADOW_OFFSET = 8
+SHADOW_COLOR = QColor(0, 0, 0, 40)
+# Window padding around the container, sized so the offset shadow fits.
+SHADOW_MARGINS = QMargins(
+    SHADOW_SPREAD - SHADOW_OFFSET,
+    SHADOW_SPREAD - SHADOW_OFFSET,
+    SHADOW_SPREAD + SHADOW_OFFSET,
+    SHADOW_SPREAD + SHADOW_OFFSET,
+)
+# Container width; the window adds SHADOW_MARGINS around it.
+CONTENT_WIDTH = 400
+POPUP_WIDTH = CONTENT_WIDTH + SHADOW_MARGINS.left() + SHADOW_MARGINS.right()
+MARGIN_HEIGHT = SHADOW_MARGINS.top() + SHADOW_MARGINS.bottom()
+
+_shadow_pixmap: QPixmap | None = None
+
+
+def _get_shadow_pixmap() -> QPixmap:
+    """
+    Blurred shadow of a small rounded box, rendered once on first use.
+    Its outer 2 * SHADOW_SPREAD pixels are the corners and edges of a
+    nine-slice border; the middle stretches to any container size.
+    """
+    global _shadow_pixmap
+    if _shadow_pixmap is not None:
+        return _shadow_pixmap
+
+    size = 4 * SHADOW_SPREAD + 1
+    box = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+    box.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(box)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(SHADOW_COLOR)
+    painter.drawRoundedRect(QRectF(SHADOW_SPREAD, SHADOW_SPREAD, size - 2 * SHADOW_SPREAD, size - 2 * SHADOW_SPREAD), 4, 4)
+    painter.end()
+
+    # Blur through a throwaway scene: the one-off cost of the old effect.
+    blur = QGraphicsBlurEffect()
+    blur.setBlurRadius(SHADOW_BLUR)
+    item = QGraphicsPixmapItem(QPixmap.fromImage(box))
+    item.setGraphicsEffect(blur)
+    scene = QGraphicsScene()
+    scene.addItem(item)
+
+    shadow = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+    shadow.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(shadow)
+    bounds = QRectF(0, 0, size, size)
+    scene.render(painter, bounds, bounds)
+    painter.end()
+
+    _shadow_pixmap = QPixmap.fromImage(shadow)
+    return _shadow_pixmap
+
+
+_POPUP_QSS = """
+    QFrame#popupContainer {
+        background-color: #FFFFFF;
+        border: 1px solid #d4cfc4;
+        border-radius: 4px;
+    }
+    QFrame#headerFrame {
+        background-color: #FFFFFF;
+        border-bottom: 1px solid #e8e3db;
+    }
+    QLabel#wordTitle {
+        font-family: 'Times New Roman', serif;
+        font-size: 32px;
+        font-weight: 800;
+        color: #2a2520;
+    }
+    QLabel#pronunciation {
+        font-family: sans-serif;
+        font-size: 13px;
+        color: #7a7066;
+        font-style: italic;
+    }
+    QLabel#partOfSpeech {
+        font-family: sans-serif;
+        font-size: 11px;
+        color: #8b7f6f;
+        font-weight: bold;
+        font-style: italic;
+        background-color: #f5f2ed;
+        padding: 2px 6px;
+        border-radius: 3px;
+    }
+    QFrame#separator {
+        color: #e8e3db;
+        background-color: #e8e3db;
+        max-height: 1px;
+    }
+    QWidget#contentWidget {
+        background-color: #FFFFFF;
+    }
+    QScrollArea {
+        border: none;
+        background-color: #FFFFFF;
+    }
+    QLabel.defNumber {
+        font-family: 'Times New Roman', serif;
+        font-size: 16px;
+        font-weight: bold;
+        color: #6b5f51;
+    }
+    QLabel.defPos {
+        font-family: sans-serif;
+        font-size: 11px;
+        color: #8b7f6f;
+        font-weight: bold;
+        font-style: italic;
+        background-color: #f5f2ed;
+        padding: 1px 4px;
+        border-radius: 3px;
+    }
+    QLabel.defText {
+        font-family: sans-serif;
+        font-size: 13px;
+        line-height: 1.5;
+        color: #3a342e;
+    }
+    QPushButton#expandBtn {
+        background-color: #faf8f5;
+        border: 1px solid #e0dbd0;
+        border-radius: 2px;
+        color: #5a5248;
+        font-size: 12px;
+        padding: 10px;
+        text-align: center;
+    }
+    QPushButton#expandBtn:hover {
+        background-color: #f2ede5;
+        border-color: #d0c9bb;
+        color: #3a342e;
+    }
+    QLabel#loadingLabel {
+        padding: 20px;
+        color: #888888;
+        font-style: italic;
+    }
+"""
+
 
 class TranslationPopup(QWidget):
     dismissed = pyqtSignal()
@@ -20,7 +188,12 @@ class TranslationPopup(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
         self._current_data = None
+        # Part-of-speech line for _current_data; results are shared with the
+        # lookup caches, so derived values live here rather than on them.
+        self._pos_summary = ""
         self._is_expanded = False
+        # Last laid-out height, read when placing the popup.
+        self.cached_height = 0
 
         self._setup_ui()
         self._apply_styling()
@@ -28,7 +201,7 @@ class TranslationPopup(QWidget):
     def _setup_ui(self):
         self._layout = QVBoxLayout(self)
         # SHADOW FIX 2: Add padding to the window so the shadow isn't clipped
-        self._layout.setContentsMargins(12, 12, 12, 12)
+        self._layout.setContentsMargins(SHADOW_MARGINS)
         
         self._container = QFrame()
         self._container.setObjectName("popupContainer")
@@ -96,98 +269,7 @@ class TranslationPopup(QWidget):
         self._container_layout.addWidget(self._loading_label)
 
     def _apply_styling(self):
-        self.setStyleSheet("""
-            QFrame#popupContainer {
-                background-color: #FFFFFF;
-                border: 1px solid #d4cfc4;
-                border-radius: 4px;
-            }
-            QFrame#headerFrame {
-                background-color: #FFFFFF;
-                border-bottom: 1px solid #e8e3db;
-            }
-            QLabel#wordTitle {
-                font-family: 'Times New Roman', serif;
-                font-size: 32px;
-                font-weight: 800;
-                color: #2a2520;
-            }
-            QLabel#pronunciation {
-                font-family: sans-serif;
-                font-size: 13px;
-                color: #7a7066;
-                font-style: italic;
-            }
-            QLabel#partOfSpeech {
-                font-family: sans-serif;
-                font-size: 11px;
-                color: #8b7f6f;
-                font-weight: bold;
-                font-style: italic;
-                background-color: #f5f2ed;
-                padding: 2px 6px;
-                border-radius: 3px;
-            }
-            QFrame#separator {
-                color: #e8e3db;
-                background-color: #e8e3db;
-                max-height: 1px;
-            }
-            QWidget#contentWidget {
-                background-color: #FFFFFF;
-            }
-            QScrollArea {
-                border: none;
-                background-color: #FFFFFF;
-            }
-            QLabel.defNumber {
-                font-family: 'Times New Roman', serif;
-                font-size: 16px;
-                font-weight: bold;
-                color: #6b5f51;
-            }
-            QLabel.defPos {
-                font-family: sans-serif;
-                font-size: 11px;
-                color: #8b7f6f;
-                font-weight: bold;
-                font-style: italic;
-                background-color: #f5f2ed;
-                padding: 1px 4px;
-                border-radius: 3px;
-            }
-            QLabel.defText {
-                font-family: sans-serif;
-                font-size: 13px;
-                line-height: 1.5;
-                color: #3a342e;
-            }
-            QPushButton#expandBtn {
-                background-color: #faf8f5;
-                border: 1px solid #e0dbd0;
-                border-radius: 2px;
-                color: #5a5248;
-                font-size: 12px;
-                padding: 10px;
-                text-align: center;
-            }
-            QPushButton#expandBtn:hover {
-                background-color: #f2ede5;
-                border-color: #d0c9bb;
-                color: #3a342e;
-            }
-            QLabel#loadingLabel {
-                padding: 20px;
-                color: #888888;
-                font-style: italic;
-            }
-        """)
-
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(24)
-        shadow.setYOffset(8)
-        shadow.setColor(QColor(0, 0, 0, 40))
-        self._container.setGraphicsEffect(shadow)
+        self.setStyleSheet(_POPUP_QSS)
 
     def show_loading(self, term: str):
         self._word_label.setText(term)
@@ -198,11 +280,16 @@ class TranslationPopup(QWidget):
         self._scroll_area.hide()
         self._loading_label.show()
         
-        # SHADOW FIX 3: Width must account for margins (400 + 12 + 12 = 424)
-        self.resize(424, 164)
+        # SHADOW FIX 3: Size must account for the shadow margins
+        self.resize(POPUP_WIDTH, 140 + MARGIN_HEIGHT)
         self.show()
 
     def show_result(self, data: dict):
+        # Cached lookups hand back the same dict; reuse its summary.
+        if data is not self._current_data:
+            self._pos_summary = ", ".join(
+                sorted({d.get("pos", "") for d in data.get("definitions", [])})
+            )
         self._current_data = data
         self._is_expanded = False
         
@@ -212,8 +299,7 @@ class TranslationPopup(QWidget):
         self._word_label.setText(data.get("word", ""))
         self._phonetic_label.setText(data.get("phonetic", ""))
         
-        unique_pos = sorted(list(set(d.get("pos", "") for d in data.get("definitions", []))))
-        self._pos_summary_label.setText(", ".join(unique_pos))
+        self._pos_summary_label.setText(self._pos_summary)
         self._pos_summary_label.show()
 
         self._render_definitions()
@@ -240,18 +326,18 @@ class TranslationPopup(QWidget):
             btn.clicked.connect(self._toggle_expand)
             self._content_layout.addWidget(btn)
 
-        QApplication.processEvents()
-        self._content_widget.adjustSize()
-        self._header_frame.adjustSize()
+        # Lay out synchronously; pumping events here could run unrelated
+        # paints and input before the popup shows.
+        self._content_layout.activate()
+        self._header_frame.layout().activate()
 
         content_height = self._content_widget.sizeHint().height()
         header_height = self._header_frame.sizeHint().height()
         
-        # SHADOW FIX 4: Add margins (24px) to height calculation
-        total_height = header_height + content_height + 10 + 24
+        # SHADOW FIX 4: Add the shadow margins to the height calculation
+        total_height = header_height + content_height + 10 + MARGIN_HEIGHT
         
-        # Width: 400 + 24 = 424
-        self.resize(424, min(524, total_height))
+        self.resize(POPUP_WIDTH, min(500 + MARGIN_HEIGHT, total_height))
 
     def _add_definition_row(self, index: int, pos: str, text: str):
         row_widget = QWidget()
@@ -286,22 +372,32 @@ class TranslationPopup(QWidget):
         self._render_definitions()
 
     def _clear_content(self):
-        while self._content_layout.count():
-            item = self._content_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # From the back, so no takeAt shifts the items behind it.
+        for i in reversed(range(self._content_layout.count())):
+            item = self._content_layout.takeAt(i)
+            widget = item.widget()
+            if widget is not None:
+                widget.deleteLater()
 
     def _to_roman(self, n: int) -> str:
-        val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-        syb = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
-        roman_num = ''
-        i = 0
-        while n > 0:
-            for _ in range(n // val[i]):
-                roman_num += syb[i]
-                n -= val[i]
-            i += 1
-        return roman_num
+        return _ROMAN[n] if 0 <= n < len(_ROMAN) else _compute_roman(n)
+
+    def paintEvent(self, event):
+        # Shadow tiles blitted around the container instead of a per-paint
+        # blur; SHADOW_MARGINS leaves exactly enough room for them.
+        target = self._container.geometry().translated(
+            SHADOW_OFFSET, SHADOW_OFFSET
+        ).adjusted(-SHADOW_SPREAD, -SHADOW_SPREAD, SHADOW_SPREAD, SHADOW_SPREAD)
+        margin = 2 * SHADOW_SPREAD
+        painter = QPainter(self)
+        qDrawBorderPixmap(
+            painter, target, QMargins(margin, margin, margin, margin), _get_shadow_pixmap()
+        )
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.cached_height = event.size().height()
 
     def closeEvent(self, event):
         self.dismissed.emit()
@@ -1,5 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QComboBox
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, QTimer
+
+from ...viewmodels.zoom_viewmodel import ZoomViewModel
 
 class ZoomControls(QWidget):
     """
@@ -20,6 +22,13 @@ class ZoomControls(QWidget):
         super().__init__()
         self._setup_ui()
         self._updating_combo = False
+
+        # Zoom ticks arrive faster than the combo needs repainting; only the
+        # latest display state is applied, once per event-loop pass.
+        self._pending_display = None
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.timeout.connect(self._apply_zoom_display)
     
     def _setup_ui(self):
         layout = QHBoxLayout(self)
@@ -51,9 +60,16 @@ class ZoomControls(QWidget):
         self._combo.addItem("200%", 200)
         self._combo.addItem("300%", 300)
         self._combo.addItem("400%", 400)
+
+        # Item value -> index; the item list never changes after setup.
+        self._data_to_index = {
+            self._combo.itemData(i): i
+            for i in range(self._combo.count())
+            if self._combo.itemData(i) is not None
+        }
         
         # Set default to 100%
-        index = self._combo.findData(100)
+        index = self._data_to_index.get(100, -1)
         if index >= 0:
             self._combo.setCurrentIndex(index)
         
@@ -98,14 +114,23 @@ class ZoomControls(QWidget):
         is_fit_mode: True if in fit-width or fit-page mode
         fit_mode_name: "Fit Width" or "Fit Page" if in fit mode
         """
+        self._pending_display = (zoom_level, is_fit_mode, fit_mode_name)
+        self._display_timer.start(0)
+
+    def _apply_zoom_display(self):
+        if self._pending_display is None:
+            return
+        zoom_level, is_fit_mode, fit_mode_name = self._pending_display
+        self._pending_display = None
+
         self._updating_combo = True
         
         if is_fit_mode and fit_mode_name:
             # Select the fit mode in dropdown
             if fit_mode_name == "Fit Width":
-                index = self._combo.findData(self.FIT_WIDTH_VALUE)
+                index = self._data_to_index.get(self.FIT_WIDTH_VALUE, -1)
             elif fit_mode_name == "Fit Page":
-                index = self._combo.findData(self.FIT_PAGE_VALUE)
+                index = self._data_to_index.get(self.FIT_PAGE_VALUE, -1)
             else:
                 index = -1
             
@@ -113,7 +138,7 @@ class ZoomControls(QWidget):
                 self._combo.setCurrentIndex(index)
         else:
             # Check if this is a preset value
-            index = self._combo.findData(zoom_level)
+            index = self._data_to_index.get(zoom_level, -1)
             if index >= 0:
                 self._combo.setCurrentIndex(index)
             else:
@@ -122,7 +147,6 @@ class ZoomControls(QWidget):
                 pass
         
         # Update button states
-        from ...viewmodels.zoom_viewmodel import ZoomViewModel
         self._btn_out.setEnabled(zoom_level > ZoomViewModel.MIN_ZOOM)
         self._btn_in.setEnabled(zoom_level < ZoomViewModel.MAX_ZOOM)
         